@@ -0,0 +1,6 @@
+import os
+
+if os.environ.get("FROZEN_DATA_PRELOAD") == "1":
+    # parse db_config at import so forked workers share it copy-on-write
+    from .config.config import DatabaseConfig
+    DatabaseConfig.preload()
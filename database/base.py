@@ -1,29 +1,99 @@
-from .config import db_config
+import threading
+from functools import cache
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, Optional
 
-database_cfg = db_config["database"]
-datasource_cfg = db_config["datasource"]
 
+@cache
+def _get_cfg():
+    from .config import db_config
+    return db_config["database"], db_config["datasource"]
+
+
+def __getattr__(name):
+    if name == "database_cfg":
+        return _get_cfg()[0]
+    if name == "datasource_cfg":
+        return _get_cfg()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(slots=True, init=False, eq=False)
 class DatabaseConnection:
-    
-    _instance = None
+    host: Optional[str]
+    port: Optional[int]
+    username: Optional[str]
+    password: Optional[str] = field(repr=False)
+    data_path: Optional[str]
+    factor_path: Optional[str]
+    _initialized: bool = field(default=False, repr=False, compare=False)
+
+    # one instance per distinct connection setting, so that building a
+    # mongodb connection never overwrites a live duckdb one and vice versa
+    _instances: ClassVar[Dict[tuple, "DatabaseConnection"]] = {}
 
     def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        key = cls._key(*args, **kwargs)
+        if key not in cls._instances:
+            # NOTE: zero-arg super() breaks once dataclass rebuilds the class with slots
+            cls._instances[key] = object.__new__(cls)
+        return cls._instances[key]
+
+    @staticmethod
+    def _key(host=None, port=None, username=None, password=None, data_path=None, factor_path=None):
+        # normalized field values, however they were passed
+        return (host, port, username, password, data_path, factor_path)
 
     def __init__(self, host=None, port=None, username=None, password=None, data_path=None, factor_path=None):
+        if getattr(self, "_initialized", False):
+            return
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.data_path = data_path
         self.factor_path = factor_path
+        self._initialized = True
     
     def connect(self):
         return f"Connecting to database at {self.host}:{self.port} with user {self.username} and path {self.data_path}."
 
 
+# read-write duckdb connections opened by DataFeedManager, keyed by file path.
+# duckdb allows a single configuration per file within a process, so loaders
+# query through the live connection instead of opening a read-only one.
+_DUCKDB_CONNECTIONS: Dict[str, list] = {}
+_DUCKDB_LOCK = threading.Lock()
+
+
+def acquire_duckdb(data_path):
+    import duckdb
+    with _DUCKDB_LOCK:
+        entry = _DUCKDB_CONNECTIONS.get(data_path)
+        if entry is None:
+            entry = _DUCKDB_CONNECTIONS[data_path] = [duckdb.connect(data_path), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_duckdb(data_path):
+    with _DUCKDB_LOCK:
+        entry = _DUCKDB_CONNECTIONS.get(data_path)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] == 0:
+            # last holder gone, free the file lock for other processes
+            del _DUCKDB_CONNECTIONS[data_path]
+            entry[0].close()
+
+
+def shared_duckdb(data_path):
+    with _DUCKDB_LOCK:
+        entry = _DUCKDB_CONNECTIONS.get(data_path)
+        return None if entry is None else entry[0]
+
+
 class ConnectionBuilder:
     def __init__(self, host=None, port=None, username=None, password=None, **kwargs):
         self._config = {
@@ -45,17 +115,19 @@ class ConnectionBuilder:
         return DatabaseConnection(**self._config)
 
 
+_FILE_PATH_DBS = frozenset({"duckdb", "chdb"})
+_NO_PATH_DBS = frozenset({"mongodb"})
+
+
+@cache
 def connection_factory(db_type):
-    builder = ConnectionBuilder(**database_cfg[db_type])
-    match db_type:
-        case "mongodb":
-            pass
-        case "duckdb":
-            builder.set_data_file_path(database_cfg[db_type]["data_path"])\
-                   .set_factor_file_path(database_cfg[db_type]["factor_path"])
-        case "chdb":
-            builder.set_data_file_path(database_cfg[db_type]["data_path"])\
-                   .set_factor_file_path(database_cfg[db_type]["factor_path"])
-        case _:
-            raise NotImplementedError(f"Database {db_type} not implemented yet.")
-    return builder.build()
\ No newline at end of file
+    # connections are immutable once built, so resolve each db_type only once
+    database_cfg, _ = _get_cfg()
+    if db_type not in _FILE_PATH_DBS and db_type not in _NO_PATH_DBS:
+        raise NotImplementedError(f"Database {db_type} not implemented yet.")
+    cfg = database_cfg[db_type]
+    builder = ConnectionBuilder(**cfg)
+    if db_type in _FILE_PATH_DBS:
+        builder.set_data_file_path(cfg["data_path"])\
+               .set_factor_file_path(cfg["factor_path"])
+    return builder.build()
@@ -1 +1,5 @@
-from .config import db_config
\ No newline at end of file
+def __getattr__(name):
+    if name == "db_config":
+        from .config import db_config
+        return db_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
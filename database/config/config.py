@@ -1,42 +1,136 @@
 import os
-from typing import Any, Dict
-from dataclasses import dataclass, field
-from ...basis import yamler
+import pickle
+import pathlib
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, Optional
+
+import yaml
+try:
+    # libyaml bindings, an order of magnitude faster than the pure python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+_PROJ_PATH = str(pathlib.Path(__file__).resolve().parents[2])
+
+
+def _freeze(config: Any) -> Any:
+    t = type(config)
+    if t is dict:
+        return MappingProxyType({k: _freeze(v) for k, v in config.items()})
+    if t is list:
+        return tuple(_freeze(i) for i in config)
+    return config
+
 
-@dataclass
 class DatabaseConfig:
-    db_config: Dict[str, Any] = field(init=False)
 
-    def __post_init__(self):
-        self.proj_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        db_config = yamler(f"{self.proj_path}/database/config/db_config.yaml").get_all_fields()
-        self.db_config = self.replace_proj_path(db_config)
+    __slots__ = ("proj_path", "db_config", "_token", "_replace", "_initialized")
+
+    _instance: ClassVar[Optional["DatabaseConfig"]] = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        # the yaml is parsed once per process, later instantiations are no-ops
+        if getattr(self, "_initialized", False):
+            return
+        self.proj_path = _PROJ_PATH
+        self._token = "$proj_path$"
+        self._replace = self.proj_path
+        yaml_path = f"{self.proj_path}/database/config/db_config.yaml"
+        cache_path = f"{yaml_path}.pkl"
+
+        db_config = self.load_cache(cache_path, yaml_path)
+        if db_config is None:
+            db_config = self.replace_proj_path(self.load_yaml(yaml_path))
+            self.dump_cache(cache_path, db_config)
+        # read-only view shared by every consumer, no defensive copies needed
+        self.db_config = _freeze(db_config)
+        self._initialized = True
+    
+    @classmethod
+    def preload(cls) -> "DatabaseConfig":
+        """
+        Parse the config eagerly, e.g. in a parent process before forking
+        workers so that they inherit the parsed tree instead of re-reading it.
+        """
+        return cls()
+    
+    @staticmethod
+    def load_yaml(file_path: str) -> Dict[str, Any]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return yaml.load(f, Loader=SafeLoader)
+    
+    def load_cache(self, cache_path: str, yaml_path: str) -> Optional[Dict[str, Any]]:
+        """Load the parsed config from the pickle sidecar if it is newer than the yaml."""
+        try:
+            if os.stat(cache_path).st_mtime < os.stat(yaml_path).st_mtime:
+                return None
+            with open(cache_path, "rb") as f:
+                proj_path, db_config = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        # the cache holds resolved paths, discard it once the project is moved
+        return db_config if proj_path == self.proj_path else None
     
-    def replace_proj_path(self, config: Any) -> Any:
-        # NOTE: python introduced match-case statement in version 3.10
-        match config:
-            case dict():
-                return {k: self.replace_proj_path(v) for k, v in config.items()}
-            case list():
-                return [self.replace_proj_path(i) for i in config]
-            case str():
-                return config.replace("$proj_path$", self.proj_path)
-            case others:
-                return config
+    def dump_cache(self, cache_path: str, db_config: Dict[str, Any]) -> None:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((self.proj_path, db_config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # read-only install, fall back to parsing the yaml on every start
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
-    # for python version < 3.10
-    # def replace_proj_path(self, config: Any) -> Any:
-    #     if isinstance(config, dict):
-    #         return {k: self.replace_proj_path(v) for k, v in config.items()}
-    #     elif isinstance(config, list):
-    #         return [self.replace_proj_path(i) for i in config]
-    #     elif isinstance(config, str):
-    #         return config.replace('$proj_path$', self.proj_path)
-    #     else:
-    #         return config
+    def replace_proj_path(self, config: Any, memo: Optional[Dict[int, Any]] = None) -> Any:
+        # Iterative walk that patches strings in place, nodes without
+        # "$proj_path$" are left untouched instead of being rebuilt
+        token, repl = self._token, self._replace
+        t = type(config)
+        if t is str:
+            return config if token not in config else config.replace(token, repl)
+        if t is not dict and t is not list:
+            return config
+        # containers shared through yaml anchors/aliases are only walked once
+        if memo is None:
+            memo = {}
+        if id(config) in memo:
+            return memo[id(config)]
+        memo[id(config)] = config
+        # first pass collects every (container, key, string) holding the
+        # token, the second applies them without mutating mid-iteration
+        changes = []
+        stack = [config]
+        while stack:
+            node = stack.pop()
+            items = node.items() if type(node) is dict else enumerate(node)
+            for k, v in items:
+                t = type(v)
+                if t is str:
+                    if token in v:
+                        changes.append((node, k, v))
+                elif (t is dict or t is list) and id(v) not in memo:
+                    memo[id(v)] = v
+                    stack.append(v)
+        for node, k, v in changes:
+            node[k] = v.replace(token, repl)
+        return config
     
     def format_config_str(self, config_str):
-        config_str = config_str.replace("$proj_path$", self.proj_path)
-        return config_str
+        if self._token not in config_str:
+            return config_str
+        return config_str.replace(self._token, self._replace)
 
-db_config = DatabaseConfig().db_config
+def __getattr__(name: str) -> Any:
+    # parse the yaml on first access rather than at import time (PEP 562)
+    if name == "db_config":
+        db_config = DatabaseConfig().db_config
+        globals()["db_config"] = db_config
+        return db_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
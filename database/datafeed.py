@@ -1,23 +1,28 @@
-import re
+import weakref
+import hashlib
 import logging
 import datetime
 import warnings
 import pandas as pd
+import pyarrow as pa
 import tushare as ts
 from tqdm import tqdm
-from typing import Union, Dict
+from typing import Union, Dict, Tuple
+from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
 
-import duckdb
 import chdb
 from chdb.session import Session
 from pymongo import MongoClient, errors
 
 from .utils.log import L
-from .base import datasource_cfg
 from .utils.calendar import calendar
 from .utils.util import rate_limiter
-from .base import connection_factory
+from .utils.cache import cached, FileCache
+from .base import connection_factory, acquire_duckdb, release_duckdb, _get_cfg
 
 warnings.filterwarnings("ignore")
 logger = logging.getLogger("frozen")
@@ -53,6 +58,34 @@ class DataFeed(ABC):
         pass
 
 
+def _parse_dates(dates: pd.Series) -> pd.Series:
+    """Parse tushare `YYYYmmdd` date strings."""
+    # trade days repeat within a frame, cache=True parses each distinct string once
+    return pd.to_datetime(dates, format="%Y%m%d", cache=True)
+
+
+# numeric column dtypes matching the table DDL, so inserts read the
+# float64 buffers directly instead of coercing mixed object columns
+_FLOAT_COLUMNS = {
+    "volumn_price": ("open", "high", "low", "close", "pre_close", "change", "pct_chg", "vol", "amount"),
+    "stock_limit": ("up_limit", "down_limit"),
+    "stock_fundamental": ("turnover_rate", "volume_ratio", "pe", "pe_ttm", "pb", "ps", "ps_ttm", "dv_ratio", 
+                          "dv_ttm", "total_share", "float_share", "total_mv", "circ_mv"),
+    "stock_dividend": ("cash_div", "stk_div", "stk_bo_rate", "stk_co_rate"),
+}
+_FEED_DTYPES = {feed: dict.fromkeys(cols, "float64") for feed, cols in _FLOAT_COLUMNS.items()}
+
+
+# full-table aggregates, keyed by the table's row count so that any insert invalidates them,
+# one endpoint per table so that dropping the table clears them
+_TABLE_META_CACHE = FileCache(ttl=datetime.timedelta(days=30))
+
+
+def _feed_key(feed, *args, **kwargs):
+    # TODAY is part of the key as update fetches run up to the current date
+    return (feed.ticker, feed.START, feed.END, feed.TODAY, args, sorted(kwargs.items()))
+
+
 class TSDataFeed(DataFeed):
     """
     (T)u(S)hare Data Feed.
@@ -66,17 +99,31 @@ class TSDataFeed(DataFeed):
     - stock basic data
     """
 
+    # the api client is process-global, shared by the per-ticker feeds
+    _PRO = None
+
     def __init__(self, ticker=None, start_date=None, end_date=None):
 
-        token = datasource_cfg["tushare"]["token"]
-        ts.set_token(token)
-        self.pro = ts.pro_api()
+        self.pro = self._get_pro()
 
         self.ticker = ticker
         self.START = "20050101" if start_date is None else start_date
         self.END = "20231231" if end_date is None else end_date
-        self.TODAY = datetime.datetime.today().strftime("%Y%m%d")
 
+    @property
+    def TODAY(self):
+        # evaluated per call, a long-running process must not keep yesterday's date
+        return datetime.datetime.today().strftime("%Y%m%d")
+
+    @classmethod
+    def _get_pro(cls):
+        if cls._PRO is None:
+            _, datasource_cfg = _get_cfg()
+            ts.set_token(datasource_cfg["tushare"]["token"])
+            cls._PRO = ts.pro_api()
+        return cls._PRO
+
+    @cached(key=_feed_key)
     @rate_limiter(max_calls_per_minute=500)
     def fetch_volumn_price(self, asset="E", adj="", update=False):
         """Store instrument volumn-price data"""
@@ -84,9 +131,11 @@ class TSDataFeed(DataFeed):
         query = ts.pro_bar(self.ticker, start_date=self.START, end_date=end_date, asset=asset, adj=adj)
         if not self._check_validity(query):
             return 
-        query["trade_date"] = pd.to_datetime(query["trade_date"])
+        query["trade_date"] = _parse_dates(query["trade_date"])
+        query = query.astype(_FEED_DTYPES["volumn_price"])
         return query
     
+    @cached(key=_feed_key)
     @rate_limiter(max_calls_per_minute=500)
     def fetch_stock_limit(self, update=False):
         """Store stock gain and loss limit data"""
@@ -94,9 +143,11 @@ class TSDataFeed(DataFeed):
         query = self.pro.stk_limit(ts_code=self.ticker, start_date=self.START, end_date=end_date)
         if not self._check_validity(query):
             return 
-        query["trade_date"] = pd.to_datetime(query["trade_date"])
+        query["trade_date"] = _parse_dates(query["trade_date"])
+        query = query.astype(_FEED_DTYPES["stock_limit"])
         return query
     
+    @cached(key=_feed_key)
     @rate_limiter(max_calls_per_minute=500)
     def fetch_stock_fundamental(self, update=False):
         """Store stock fundamental data"""
@@ -105,47 +156,47 @@ class TSDataFeed(DataFeed):
                                      fields="ts_code, trade_date, turnover_rate, volume_ratio, pe, pe_ttm, pb, ps, ps_ttm, dv_ratio, dv_ttm, total_share, float_share, total_mv, circ_mv")
         if not self._check_validity(query):
             return 
-        query["trade_date"] = pd.to_datetime(query["trade_date"])
+        query["trade_date"] = _parse_dates(query["trade_date"])
+        query = query.astype(_FEED_DTYPES["stock_fundamental"])
         return query
     
+    @cached(key=_feed_key)
     @rate_limiter(max_calls_per_minute=500)
     def fetch_stock_dividend(self, update=False, **kwargs):
         """Store stock dividend data"""
         query = self.pro.dividend(ts_code=self.ticker, fields="ts_code, cash_div, stk_div, stk_bo_rate, stk_co_rate, ex_date")
         if not self._check_validity(query):
             return 
-        query.drop_duplicates(inplace=True)
-        query = query[query["ex_date"].notna()].reset_index(drop=True)
-        if update:
-            cutoff_date = kwargs.get("cutoff", None)
-            query = query[query['ex_date']>cutoff_date]
-        query["ex_date"] = pd.to_datetime(query["ex_date"])
+        query = query.drop_duplicates()
+        # parse once and filter with a single fused mask on datetime64
+        ex_date = _parse_dates(query["ex_date"])
+        mask = ex_date.notna()
+        if update and (cutoff_date := kwargs.get("cutoff")) is not None:
+            mask &= ex_date > pd.Timestamp(cutoff_date)
+        query = query.loc[mask].assign(ex_date=ex_date[mask]).reset_index(drop=True)
+        query = query.astype(_FEED_DTYPES["stock_dividend"])
         return query
     
+    @cached(key=_feed_key)
     @rate_limiter(max_calls_per_minute=500)
-    def fetch_stock_suspend(self, tradeday):
-        """Store stock suspend status information"""
-        query = self.pro.suspend_d(suspend_type="S", trade_date=tradeday)
+    def fetch_stock_suspend(self, start_date, end_date=None):
+        """Store stock suspend status information, for one trade day or a date range"""
+        end_date = start_date if end_date is None else end_date
+        query = self.pro.suspend_d(suspend_type="S", start_date=start_date, end_date=end_date)
         if not self._check_validity(query):
             return 
-        query["trade_date"] = pd.to_datetime(query["trade_date"])
+        query["trade_date"] = _parse_dates(query["trade_date"])
         return query
     
+    @cached(key=_feed_key)
     def fetch_stock_basic(self, list_status="L"):
         """Store basic information about (de)listed stocks"""
         query = self.pro.stock_basic(exchange="", list_status=list_status, fields="ts_code, name, area, industry, fullname, enname, market, exchange, list_date")
-        query["list_date"] = pd.to_datetime(query["list_date"])
+        query["list_date"] = _parse_dates(query["list_date"])
         return query
     
     def _check_validity(self, data):
-        try:
-            if data.empty:
-                return False
-        except:
-            if data is None:
-                return False
-        else:
-            return True
+        return data is not None and not data.empty
 
 
 # class CSVDataFeed(DataFeed):
@@ -168,6 +219,243 @@ class DataFeedFactory:
             raise ValueError(f"Unsupported data feed type: {source}")
 
 
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    Storage layout and fetch routine of a feed table.
+
+    The DDL templates are formatted with `table_name`.
+    """
+    fetch_method: str
+    chdb_ddl: str
+    duckdb_ddl: str
+    mongo_index: Tuple[Tuple[str, int], ...]
+    description: str = "data"
+    date_col: str = "trade_date"
+    # pass the next date after the stored one as `cutoff` on update
+    update_cutoff: bool = False
+
+    def ddl_for(self, database):
+        if database == "chdb":
+            return self.chdb_ddl
+        if database == "duckdb":
+            return self.duckdb_ddl
+        raise NotImplementedError(f"Database {database} has no DDL.")
+
+
+TABLE_SPECS: Dict[str, TableSpec] = {
+    "volumn_price": TableSpec(
+        fetch_method="fetch_volumn_price",
+        chdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code String,
+                    trade_date DateTime,
+                    close Float64,
+                    open Float64,
+                    high Float64,
+                    low Float64,
+                    pre_close Float64,
+                    change Float64,
+                    pct_chg Float64,
+                    vol Float64,
+                    amount Float64,
+                    PRIMARY KEY (ts_code, trade_date)
+                )
+                ENGINE = ReplacingMergeTree
+                ORDER BY (ts_code, trade_date);
+                """,
+        duckdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code VARCHAR,
+                    trade_date TIMESTAMP,
+                    open DOUBLE,
+                    high DOUBLE,
+                    low DOUBLE,
+                    close DOUBLE,
+                    pre_close DOUBLE,
+                    change DOUBLE,
+                    pct_chg DOUBLE,
+                    vol DOUBLE,
+                    amount DOUBLE,
+                    PRIMARY KEY (ts_code, trade_date)
+                )
+                """,
+        mongo_index=(("ts_code", 1), ("trade_date", 1)),
+        description="volumn-price data",
+    ),
+    "stock_limit": TableSpec(
+        fetch_method="fetch_stock_limit",
+        chdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    trade_date DateTime,
+                    ts_code String,
+                    up_limit Float64,
+                    down_limit Float64,
+                    PRIMARY KEY (ts_code, trade_date)
+                )
+                ENGINE = ReplacingMergeTree
+                ORDER BY (ts_code, trade_date);
+                """,
+        duckdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    trade_date TIMESTAMP,
+                    ts_code VARCHAR,
+                    up_limit DOUBLE,
+                    down_limit DOUBLE,
+                    PRIMARY KEY (ts_code, trade_date)
+                )
+                """,
+        mongo_index=(("ts_code", 1), ("trade_date", 1)),
+        description="price data",
+    ),
+    "stock_fundamental": TableSpec(
+        fetch_method="fetch_stock_fundamental",
+        chdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code String,
+                    trade_date DateTime,
+                    turnover_rate Float64,
+                    volume_ratio Float64,
+                    pe Float64,
+                    pe_ttm Float64,
+                    pb Float64,
+                    ps Float64,
+                    ps_ttm Float64,
+                    dv_ratio Float64,
+                    dv_ttm Float64,
+                    total_share Float64,
+                    float_share Float64,
+                    total_mv Float64,
+                    circ_mv Float64,
+                    PRIMARY KEY (ts_code, trade_date)
+                )
+                ENGINE = ReplacingMergeTree
+                ORDER BY (ts_code, trade_date);
+                """,
+        duckdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code VARCHAR,
+                    trade_date TIMESTAMP,
+                    turnover_rate DOUBLE,
+                    volume_ratio DOUBLE,
+                    pe DOUBLE,
+                    pe_ttm DOUBLE,
+                    pb DOUBLE,
+                    ps DOUBLE,
+                    ps_ttm DOUBLE,
+                    dv_ratio DOUBLE,
+                    dv_ttm DOUBLE,
+                    total_share DOUBLE,
+                    float_share DOUBLE,
+                    total_mv DOUBLE,
+                    circ_mv DOUBLE,
+                    PRIMARY KEY (ts_code, trade_date)
+                )
+                """,
+        mongo_index=(("ts_code", 1), ("trade_date", 1)),
+    ),
+    "stock_dividend": TableSpec(
+        fetch_method="fetch_stock_dividend",
+        chdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code String,
+                    stk_div Float64,
+                    stk_bo_rate Float64,
+                    stk_co_rate Float64,
+                    cash_div Float64,
+                    ex_date DateTime,
+                    PRIMARY KEY (ts_code, ex_date)
+                )
+                ENGINE = MergeTree
+                ORDER BY (ts_code, ex_date);
+                """,
+        duckdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code VARCHAR,
+                    stk_div DOUBLE,
+                    stk_bo_rate DOUBLE,
+                    stk_co_rate DOUBLE,
+                    cash_div DOUBLE,
+                    ex_date TIMESTAMP,
+                    PRIMARY KEY (ts_code, ex_date)
+                )
+                """,
+        mongo_index=(("ts_code", 1), ("ex_date", 1)),
+        date_col="ex_date",
+        update_cutoff=True,
+    ),
+    "stock_suspend": TableSpec(
+        fetch_method="fetch_stock_suspend",
+        chdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code String,
+                    trade_date DateTime,
+                    suspend_timing Nullable(String),
+                    suspend_type String,
+                    PRIMARY KEY trade_date
+                )
+                ENGINE = MergeTree
+                ORDER BY trade_date;
+                """,
+        duckdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code VARCHAR,
+                    trade_date TIMESTAMP,
+                    suspend_timing VARCHAR,
+                    suspend_type VARCHAR,
+                )
+                """,
+        mongo_index=(),
+    ),
+    "stock_basic": TableSpec(
+        fetch_method="fetch_stock_basic",
+        chdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code String,
+                    name String,
+                    area String,
+                    industry String,
+                    fullname String,
+                    enname String,
+                    market String,
+                    exchange String,
+                    list_date DateTime,
+                    PRIMARY KEY ts_code
+                )
+                ENGINE = ReplacingMergeTree
+                ORDER BY list_date;
+                """,
+        duckdb_ddl="""
+                CREATE TABLE IF NOT EXISTS {table_name}
+                (
+                    ts_code VARCHAR PRIMARY KEY,
+                    name VARCHAR,
+                    area VARCHAR,
+                    industry VARCHAR,
+                    fullname VARCHAR,
+                    enname VARCHAR,
+                    market VARCHAR,
+                    exchange VARCHAR,
+                    list_date TIMESTAMP
+                )
+                """,
+        mongo_index=(("ts_code", 1),),
+        date_col="list_date",
+    ),
+}
+
+
 class DataFeedManager:
     """
     The Data (E)xtract, (T)ransform, (L)oad Pipeline Module.
@@ -194,6 +482,16 @@ class DataFeedManager:
     and modifications to meet evolving data management requirements.
     """
 
+    # number of fetched frames (tickers or trade days) buffered per bulk insert
+    INSERT_BATCH_SIZE = 200
+    # concurrent api requests, throttled by the feeds' rate limiter
+    FETCH_WORKERS = 8
+    # rows per backend insert call, bounds the statement / batch size of a
+    # single insert, mongodb stays well under the 16MB BSON message limit
+    INSERT_CHUNK_SIZE = {"chdb": 10_000, "duckdb": 100_000, "mongodb": 10_000}
+    # rows returned by one suspend_d call at most, a full response may be truncated
+    SUSPEND_ROW_LIMIT = 5000
+
     def __init__(self, source, database, ticker_list, start_date=None, end_date=None):
 
         self.source = source
@@ -204,23 +502,44 @@ class DataFeedManager:
             # Specify database storage path
             storage_path = connection.data_path
             self.db = Session(path=storage_path)
+            self._db_key = storage_path
             self._query("CREATE DATABASE IF NOT EXISTS BaseDB")
             self._query(("USE BaseDB"))
         elif database == "duckdb":
-            self.db = connection.data_path
+            # one connection for the manager's lifetime, opening the file
+            # loads the catalog and replays the WAL every time
+            self.db = acquire_duckdb(connection.data_path)
+            self._db_key = connection.data_path
+            # a weak finalizer, an atexit hook would keep every manager alive
+            self._finalizer = weakref.finalize(self, release_duckdb, connection.data_path)
             self._init_duckdb()
         elif database == "mongodb":
             client = MongoClient(host=connection.host, port=connection.port)
             self.db = client.FrozenBacktest
+            self._db_key = f"{connection.host}:{connection.port}/FrozenBacktest"
         else:
             raise NotImplementedError(f"Database {database} not supported yet.")
         
         self.ticker_list = ticker_list
+        self._ticker_set = frozenset(ticker_list)
+        # distinct ts_code per table, dropped whenever the table is written to
+        self._table_ticker_cache = {}
+        # tables known to exist, so DDL checks run once per manager
+        self._ensured_tables = set()
         self.start_date = "20050101" if start_date is None or str(start_date).lower() == 'none' else start_date
         self.end_date = "20231231" if end_date is None or str(end_date).lower() == 'none' else end_date
         self.data_feeds = self._load_datafeed()
 
-        self.TODAY = datetime.datetime.today().strftime("%Y%m%d")
+    @property
+    def TODAY(self):
+        # evaluated per call like TSDataFeed.TODAY, updates run up to the current date
+        return datetime.datetime.today().strftime("%Y%m%d")
+
+    def _close(self):
+        """Release the duckdb connection, the file is closed once no manager holds it."""
+        if self.database == "duckdb" and self.db is not None:
+            self.db = None
+            self._finalizer()
 
     def _load_datafeed(self, ticker_list=None, start_date=None, end_date=None, **kwargs):
         """
@@ -241,472 +560,89 @@ class DataFeedManager:
         Returns:
         --------
         data_feeds: list
-            List of DataFeed objects created for each ticker.
+            List of (ticker, DataFeed) pairs, one for each ticker.
         """
         ticker_list = self.ticker_list if ticker_list is None else ticker_list
         start_date = self.start_date if start_date is None else start_date
         end_date = self.end_date if end_date is None else end_date
         update = kwargs.get("update", False)
         table_name = kwargs.get("table_name", "")
-        date_list = kwargs.get("date_list", [])
+        date_col = kwargs.get("date_col", None)
         
         if update:
             assert len(table_name) != 0, "table name must be provided when `update` is set to `True`"
-            table_date = self._get_table_date(table_name, latest=False)
+            ticker_dates = self._get_ticker_dates(self._get_table_date(table_name, latest=False, date_col=date_col), shift=1)
             end_date = self.TODAY
         
         data_feeds = []
-
-        if len(date_list) > 0:
-            for _ in date_list:
-                data_feed = DataFeedFactory.create_data_feed(self.source)
-                data_feeds.append(data_feed)
-            return data_feeds
-        
         for ticker in ticker_list:
             if update:
-                start_date = self._get_ticker_date(table_date, ticker, shift=1)
+                start_date = ticker_dates.get(ticker, self.start_date)
             data_feed = DataFeedFactory.create_data_feed(self.source, ticker, start_date, end_date)
-            data_feeds.append(data_feed)
+            data_feeds.append((ticker, data_feed))
         
         return data_feeds
 
     def fetch_volumn_price_data(self, table_name, asset="E", adj="", update=False):
-        # Check if table exists, create table if not exists
-        if not self._check_table_exists(table_name):
-            if self.database == "chdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code String,
-                                trade_date DateTime,
-                                close Float64,
-                                open Float64,
-                                high Float64,
-                                low Float64,
-                                pre_close Float64,
-                                change Float64,
-                                pct_chg Float64,
-                                vol Float64,
-                                amount Float64,
-                                PRIMARY KEY (ts_code, trade_date)
-                            )
-                            ENGINE = ReplacingMergeTree
-                            ORDER BY (ts_code, trade_date);
-                            """)
-            if self.database == "duckdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code VARCHAR,
-                                trade_date TIMESTAMP,
-                                open DOUBLE,
-                                high DOUBLE,
-                                low DOUBLE,
-                                close DOUBLE,
-                                pre_close DOUBLE,
-                                change DOUBLE,
-                                pct_chg DOUBLE,
-                                vol DOUBLE,
-                                amount DOUBLE,
-                                PRIMARY KEY (ts_code, trade_date)
-                            )
-                            """)
-            if self.database == "mongodb":
-                self.db.create_collection(table_name)
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "create_index",
-                    "index_fields": [("ts_code", 1), ("trade_date", 1)],
-                    "unique": True
-                }
-                self._query(query_str)
-            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} volumn-price data.")
-        
-        # Incremental update based on existing data
-        if update:
-            if self._check_table_empty(table_name):
-                raise LookupError(f"Table is empty, insert data into table {table_name} first!")
-            table_ticker_list = self._get_table_ticker(table_name)
-            data_feeds = self._load_datafeed(table_ticker_list, update=True, table_name=table_name)
-            for ticker, feed in tqdm(zip(table_ticker_list, data_feeds), total=len(data_feeds), desc="Incremeantal fetch:"):
-                data = feed.fetch_volumn_price(asset=asset, adj=adj, update=True)
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            # for tickers other than existing ticker
-            extra_ticker_list = list(set(self.ticker_list).difference(table_ticker_list))
-            extra_data_feeds = self._load_datafeed(extra_ticker_list, end_date=self.TODAY)
-            for ticker, feed in tqdm(zip(extra_ticker_list, extra_data_feeds), total=len(extra_data_feeds), desc="Incremeantal extra fetch:"):
-                data = feed.fetch_volumn_price(asset=asset, adj=adj, update=True)
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            logger.info(f"{table_name} data update completed.")
-        else:
-            # Perform data extraction, transformation and insertion in a loop
-            for ticker, feed in tqdm(zip(self.ticker_list, self.data_feeds), total=len(self.data_feeds), desc="Normal fetch:"):
-                if not self._check_data_exists(table_name, ticker):
-                    data = feed.fetch_volumn_price(asset=asset, adj=adj)
-                    if not self._check_validity(data):
-                        logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                        continue
-                    self._insert_df_to_table(data, table_name)
-                else:
-                    continue
-            logger.info(f"{table_name} data insertion completed.")
+        return self._fetch_generic(TABLE_SPECS["volumn_price"], table_name, update, asset=asset, adj=adj)
     
     def fetch_stock_limit_data(self, table_name="stock_daily_limit", update=False):
-        if not self._check_table_exists(table_name):
-            if self.database == "chdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                trade_date DateTime,
-                                ts_code String,
-                                up_limit Float64,
-                                down_limit Float64,
-                                PRIMARY KEY (ts_code, trade_date)
-                            )
-                            ENGINE = ReplacingMergeTree
-                            ORDER BY (ts_code, trade_date);
-                            """)
-            if self.database == "duckdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                trade_date TIMESTAMP,
-                                ts_code VARCHAR,
-                                up_limit DOUBLE,
-                                down_limit DOUBLE,
-                                PRIMARY KEY (ts_code, trade_date)
-                            )
-                            """)
-            if self.database == "mongodb":
-                self.db.create_collection(table_name)
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "create_index",
-                    "index_fields": [("ts_code", 1), ("trade_date", 1)],
-                    "unique": True
-                }
-                self._query(query_str)
-            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} price data.")
-        
-        if update:
-            if self._check_table_empty(table_name):
-                raise LookupError(f"Table is empty, insert data into table {table_name} first!")
-            table_ticker_list = self._get_table_ticker(table_name)
-            data_feeds = self._load_datafeed(table_ticker_list, update=True, table_name=table_name)
-            for ticker, feed in tqdm(zip(table_ticker_list, data_feeds), total=len(data_feeds), desc="Incremeantal fetch:"):
-                data = feed.fetch_stock_limit(update=True)
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            extra_ticker_list = list(set(self.ticker_list).difference(table_ticker_list))
-            extra_data_feeds = self._load_datafeed(extra_ticker_list, end_date=self.TODAY)
-            for ticker, feed in tqdm(zip(extra_ticker_list, extra_data_feeds), total=len(extra_data_feeds), desc="Incremeantal extra fetch:"):
-                data = feed.fetch_stock_limit()
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            logger.info(f"{table_name} data update completed.")
-        else:
-            for ticker, feed in tqdm(zip(self.ticker_list, self.data_feeds), total=len(self.data_feeds), desc="Normal fetch:"):
-                if not self._check_data_exists(table_name, ticker):
-                    data = feed.fetch_stock_limit()
-                    if not self._check_validity(data):
-                        logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                        continue
-                    self._insert_df_to_table(data, table_name)
-                else:
-                    continue
-            logger.info(f"{table_name} data insertion completed.")
+        return self._fetch_generic(TABLE_SPECS["stock_limit"], table_name, update)
     
     def fetch_stock_fundamental_data(self, table_name="stock_daily_fundamental", update=False):
-        if not self._check_table_exists(table_name):
-            if self.database == "chdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code String,
-                                trade_date DateTime,
-                                turnover_rate Float64,
-                                volume_ratio Float64,
-                                pe Float64,
-                                pe_ttm Float64,
-                                pb Float64,
-                                ps Float64,
-                                ps_ttm Float64,
-                                dv_ratio Float64,
-                                dv_ttm Float64,
-                                total_share Float64,
-                                float_share Float64,
-                                total_mv Float64,
-                                circ_mv Float64,
-                                PRIMARY KEY (ts_code, trade_date)
-                            )
-                            ENGINE = ReplacingMergeTree
-                            ORDER BY (ts_code, trade_date);
-                            """)
-            if self.database == "duckdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code VARCHAR,
-                                trade_date TIMESTAMP,
-                                turnover_rate DOUBLE,
-                                volume_ratio DOUBLE,
-                                pe DOUBLE,
-                                pe_ttm DOUBLE,
-                                pb DOUBLE,
-                                ps DOUBLE,
-                                ps_ttm DOUBLE,
-                                dv_ratio DOUBLE,
-                                dv_ttm DOUBLE,
-                                total_share DOUBLE,
-                                float_share DOUBLE,
-                                total_mv DOUBLE,
-                                circ_mv DOUBLE,
-                                PRIMARY KEY (ts_code, trade_date)
-                            )
-                            """)
-            if self.database == "mongodb":
-                self.db.create_collection(table_name)
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "create_index",
-                    "index_fields": [("ts_code", 1), ("trade_date", 1)],
-                    "unique": True
-                }
-                self._query(query_str)
-            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} data.")
-        
-        if update:
-            if self._check_table_empty(table_name):
-                raise LookupError(f"Table is empty, insert data into table {table_name} first!")
-            table_ticker_list = self._get_table_ticker(table_name)
-            data_feeds = self._load_datafeed(table_ticker_list, update=True, table_name=table_name)
-            for ticker, feed in tqdm(zip(table_ticker_list, data_feeds), total=len(data_feeds), desc="Incremeantal fetch:"):
-                data = feed.fetch_stock_fundamental(update=True)
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            extra_ticker_list = list(set(self.ticker_list).difference(table_ticker_list))
-            extra_data_feeds = self._load_datafeed(extra_ticker_list, end_date=self.TODAY)
-            for ticker, feed in tqdm(zip(extra_ticker_list, extra_data_feeds), total=len(extra_data_feeds), desc="Incremeantal extra fetch:"):
-                data = feed.fetch_stock_fundamental()
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            logger.info(f"{table_name} data update completed.")
-        else:
-            for ticker, feed in tqdm(zip(self.ticker_list, self.data_feeds), total=len(self.data_feeds), desc="Normal fetch:"):
-                if not self._check_data_exists(table_name, ticker):
-                    data = feed.fetch_stock_fundamental()
-                    if not self._check_validity(data):
-                        logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                        continue
-                    self._insert_df_to_table(data, table_name)
-                else:
-                    continue
-            logger.info(f"{table_name} data insertion completed.")
+        return self._fetch_generic(TABLE_SPECS["stock_fundamental"], table_name, update)
     
     def fetch_stock_dividend_data(self, table_name="stock_dividend", update=False):
-        if not self._check_table_exists(table_name):
-            if self.database == "chdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code String,
-                                stk_div Float64,
-                                stk_bo_rate Float64,
-                                stk_co_rate Float64,
-                                cash_div Float64,
-                                ex_date DateTime,
-                                PRIMARY KEY (ts_code, ex_date)
-                            )
-                            ENGINE = MergeTree
-                            ORDER BY (ts_code, ex_date);
-                            """)
-            if self.database == "duckdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code VARCHAR,
-                                stk_div DOUBLE,
-                                stk_bo_rate DOUBLE,
-                                stk_co_rate DOUBLE,
-                                cash_div DOUBLE,
-                                ex_date TIMESTAMP,
-                                PRIMARY KEY (ts_code, ex_date)
-                            )
-                            """)
-            if self.database == "mongodb":
-                self.db.create_collection(table_name)
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "create_index",
-                    "index_fields": [("ts_code", 1), ("ex_date", 1)],
-                    "unique": True
-                }
-                self._query(query_str)
-            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} data.")
-        
-        if update:
-            if self._check_table_empty(table_name):
-                raise LookupError(f"Table is empty, insert data into table {table_name} first!")
-            table_ticker_list = self._get_table_ticker(table_name)
-            data_feeds = self._load_datafeed(table_ticker_list, update=True, table_name=table_name)
-            table_date = self._get_table_date(table_name)
-            for ticker, feed in tqdm(zip(table_ticker_list, data_feeds), total=len(data_feeds),desc="Incremeantal fetch:"):
-                next_ticker_date = self._get_ticker_date(table_date, ticker, shift=1)
-                data = feed.fetch_stock_dividend(update=True, cutoff=next_ticker_date)
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            extra_ticker_list = list(set(self.ticker_list).difference(table_ticker_list))
-            extra_data_feeds = self._load_datafeed(extra_ticker_list, end_date=self.TODAY)
-            for ticker, feed in tqdm(zip(extra_ticker_list, extra_data_feeds), total=len(extra_data_feeds), desc="Incremeantal extra fetch:"):
-                data = feed.fetch_stock_dividend()
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            
-            logger.info(f"{table_name} data update completed.")
-        else:
-            for ticker, feed in tqdm(zip(self.ticker_list, self.data_feeds), total=len(self.data_feeds), desc="Normal fetch:"):
-                if not self._check_data_exists(table_name, ticker):
-                    data = feed.fetch_stock_dividend()
-                    if not self._check_validity(data):
-                        logger.warning(f"Table {table_name}, {ticker} data is empty.")
-                        continue
-                    self._insert_df_to_table(data, table_name)
-                else:
-                    continue
-            logger.info(f"{table_name} data insertion completed.")
+        return self._fetch_generic(TABLE_SPECS["stock_dividend"], table_name, update)
     
     def fetch_stock_suspend_data(self, table_name="stock_suspend_status", update=False):
-        if not self._check_table_exists(table_name):
-            if self.database == "chdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code String,
-                                trade_date DateTime,
-                                suspend_timing Nullable(String),
-                                suspend_type String,
-                                PRIMARY KEY trade_date
-                            )
-                            ENGINE = MergeTree
-                            ORDER BY trade_date;
-                            """)
-            if self.database == "duckdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code VARCHAR,
-                                trade_date TIMESTAMP,
-                                suspend_timing VARCHAR,
-                                suspend_type VARCHAR,
-                            )
-                            """)
-            if self.database == "mongodb":
-                self.db.create_collection(table_name)
-            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} data.")
+        self._ensure_table(table_name, TABLE_SPECS["stock_suspend"])
         
         if update:
             start_date = calendar.next_trade_day(self._get_table_date(table_name, latest=True))
-            tradeday_list = calendar.get_trade_day(start_date, self.TODAY).strftime("%Y%m%d")
-            date_for_query = calendar.get_trade_day(start_date, self.TODAY).strftime("%Y-%m-%d")
-            data_feeds = self._load_datafeed(date_list=tradeday_list)
-            for date, format_date, feed in tqdm(zip(tradeday_list, date_for_query, data_feeds), total=len(data_feeds), desc="Incremental fetch"):
-                data = feed.fetch_stock_suspend(date)
-                if not self._check_validity(data):
-                    logger.warning(f"Table {table_name}, {date} data is empty.")
-                    continue
-                self._insert_df_to_table(data, table_name)
-            logger.info(f"{table_name} data update completed.")
+            tradeday_list = calendar.get_trade_day(start_date, self.TODAY)
         else:
-            tradeday_list = calendar.get_trade_day(self.start_date, self.end_date).strftime("%Y%m%d")
-            date_for_query = calendar.get_trade_day(self.start_date, self.end_date).strftime("%Y-%m-%d")
-            data_feeds = self._load_datafeed(date_list=tradeday_list)
-            for date, format_date, feed in tqdm(zip(tradeday_list, date_for_query, data_feeds), total=len(data_feeds), desc="Normal fetch"):
-                if not self._check_data_exists(table_name, format_date):
-                    data = feed.fetch_stock_suspend(date)
-                    if not self._check_validity(data):
-                        logger.warning(f"Table {table_name}, {date} data is empty.")
-                        continue
-                    self._insert_df_to_table(data, table_name)
-                else:
-                    continue
-            logger.info(f"{table_name} data insertion completed.")
+            tradeday_list = calendar.get_trade_day(self.start_date, self.end_date)
+            # one distinct-date query instead of an existence check per trade day
+            tradeday_list = tradeday_list[~tradeday_list.isin(self._get_table_dates(table_name))]
+
+        # suspend_d takes a date range, so one call per month of trade days
+        # through a single feed replaces one call (and one feed) per day
+        feed = DataFeedFactory.create_data_feed(self.source)
+        days = pd.Series(tradeday_list.strftime("%Y%m%d"))
+        windows = {(month_days.iloc[0], month_days.iloc[-1]): list(month_days) for _, month_days in days.groupby(days.str[:6])}
+
+        def fetch_days(window_days, feed):
+            data = feed.fetch_stock_suspend(window_days[0], window_days[-1])
+            if not self._check_validity(data) or len(data) < self.SUSPEND_ROW_LIMIT:
+                return data
+            if len(window_days) == 1:
+                logger.warning(f"Suspend data on {window_days[0]} reached the {self.SUSPEND_ROW_LIMIT} row limit, it may be truncated.")
+                return data
+            # the response hit the row cap, refetch both halves of the window
+            mid = len(window_days) // 2
+            parts = [fetch_days(window_days[:mid], feed), fetch_days(window_days[mid:], feed)]
+            parts = [part for part in parts if self._check_validity(part)]
+            return pd.concat(parts, ignore_index=True) if parts else None
+
+        def fetch(window, feed):
+            data = fetch_days(windows[window], feed)
+            if not self._check_validity(data):
+                return data
+            # the range may span days that are already stored
+            return data[data["trade_date"].isin(tradeday_list)]
+
+        desc = "Incremental fetch" if update else "Normal fetch"
+        self._fetch_and_insert(table_name, [(window, feed) for window in windows], fetch, desc)
+        logger.info(f"{table_name} data {'update' if update else 'insertion'} completed.")
     
     def fetch_stock_basic_data(self, table_name, list_status="L"):
-        if not self._check_table_exists(table_name):
-            if self.database == "chdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code String,
-                                name String,
-                                area String,
-                                industry String,
-                                fullname String,
-                                enname String,
-                                market String,
-                                exchange String,
-                                list_date DateTime,
-                                PRIMARY KEY ts_code
-                            )
-                            ENGINE = ReplacingMergeTree
-                            ORDER BY list_date;
-                            """)
-            if self.database == "duckdb":
-                self._query(f"""
-                            CREATE TABLE IF NOT EXISTS {table_name}
-                            (
-                                ts_code VARCHAR PRIMARY KEY,
-                                name VARCHAR,
-                                area VARCHAR,
-                                industry VARCHAR,
-                                fullname VARCHAR,
-                                enname VARCHAR,
-                                market VARCHAR,
-                                exchange VARCHAR,
-                                list_date TIMESTAMP
-                            )
-                            """)
-            if self.database == "mongodb":
-                self.db.create_collection(table_name)
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "create_index",
-                    "index_fields": [("ts_code", 1)],
-                    "unique": True
-                }
-                self._query(query_str)
-            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} data.")
+        self._ensure_table(table_name, TABLE_SPECS["stock_basic"])
 
-        data = self.data_feeds[0].fetch_stock_basic(list_status=list_status)
+        data = DataFeedFactory.create_data_feed(self.source).fetch_stock_basic(list_status=list_status)
         if not self._check_validity(data):
             logger.warning(f"Stock basic data is empty.")
-        self._insert_df_to_table(data, table_name)
+        self._insert_df_chunked(data, table_name)
         logger.info(f"{table_name} data insertion completed.")
     
     def _check_table_exists(self, table_name=""):
@@ -723,12 +659,12 @@ class DataFeedManager:
             res = count > 0
         
         if self.database == "duckdb":
-            query_str = f"""
+            query_str = """
                         SELECT * 
                         FROM information_schema.tables 
-                        WHERE table_name='{table_name}'
+                        WHERE table_name=?
                         """
-            res = self._query(query_str, fmt="list")
+            res = self._query(query_str, fmt="list", params=[table_name])
         
         if self.database == "mongodb":
             res = table_name in self.db.list_collection_names()
@@ -736,50 +672,58 @@ class DataFeedManager:
         return res
     
     def _check_table_empty(self, table_name):
+        return self._count_rows(table_name) == 0
+    
+    def _count_rows(self, table_name):
+
+        if self.database == "chdb":
+            query_str = f"SELECT count() AS count FROM {table_name}"
+            result = self._query(query_str, "Arrow")
+            res = int(chdb.to_df(result)["count"].iloc[0])
         
         if self.database == "duckdb":
             query_str = f"SELECT COUNT(*) FROM {table_name}"
             result = self._query(query_str, fmt="tuple")
-            res = result[0] == 0
+            res = result[0]
         
         if self.database == "mongodb":
+            # collection metadata, count_documents({}) would scan every document
             query_str = {
                 "collection": f"{table_name}",
-                "action": "count_documents"
+                "action": "estimated_document_count"
             }
-            result = self._query(query_str)
-            res = result == 0
+            res = self._query(query_str)
         
         return res
     
-    def _check_data_exists(self, table_name, data_str):
-
-        if self.database == "duckdb":
-            if "." in data_str:  # ts_code
-                query_str = f"SELECT * FROM {table_name} WHERE ts_code='{data_str}'"
-            else:  # trade_date
-                query_str = f"SELECT * FROM {table_name} WHERE trade_date='{data_str}'"
-            result = self._query(query_str, fmt="list")
+    def _cached_table_meta(self, kind, table_name, scan, *key):
+        """
+        Return `scan()`, a full-table aggregate, from the on-disk cache while
+        the table's row count is unchanged, so cold restarts skip the scan.
+        """
+        endpoint = self._table_meta_endpoint(table_name)
+        cache_key = (kind, self._count_rows(table_name), key)
+        data = _TABLE_META_CACHE.get(endpoint, cache_key)
+        if data is None:
+            data = scan()
+            if self._check_validity(data):
+                _TABLE_META_CACHE.set(endpoint, cache_key, data)
+        return data
 
-        if self.database == "mongodb":
-            if "." in data_str:
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "find",
-                    "filter": {"ts_code": f"{data_str}"}
-                }
-            else:
-                formatted_data = datetime.datetime.strptime(data_str, "%Y-%m-%d")
-                query_str = {
-                    "collection": f"{table_name}",
-                    "action": "find",
-                    "filter": {"trade_date": f"{formatted_data}"}
-                }
-            result = self._query(query_str)
-        
-        return result
+    def _table_meta_endpoint(self, table_name):
+        digest = hashlib.md5(repr((self._db_key, table_name)).encode("utf-8")).hexdigest()
+        return f"table_meta/{digest}"
     
     def _get_table_ticker(self, table_name):
+        scan = lambda: pd.DataFrame({"ts_code": self._scan_table_ticker(table_name)})
+        return self._cached_table_meta("table_ticker", table_name, scan)["ts_code"].tolist()
+    
+    def _scan_table_ticker(self, table_name):
+
+        if self.database == "chdb":
+            query_str = f"SELECT DISTINCT ts_code FROM {table_name}"
+            result = self._query(query_str, "Arrow")
+            res = chdb.to_df(result)["ts_code"].tolist()
 
         if self.database == "duckdb":
             query_str = f"SELECT DISTINCT ts_code FROM {table_name}"
@@ -796,39 +740,184 @@ class DataFeedManager:
         
         return res
     
+    def _get_table_dates(self, table_name, date_col="trade_date") -> pd.DatetimeIndex:
+
+        if self.database == "chdb":
+            query_str = f"SELECT DISTINCT {date_col} FROM {table_name}"
+            result = self._query(query_str, "Arrow")
+            res = chdb.to_df(result)[date_col]
+
+        if self.database == "duckdb":
+            query_str = f"SELECT DISTINCT {date_col} FROM {table_name}"
+            result = self._query(query_str, fmt="dataframe")
+            res = result[date_col]
+        
+        if self.database == "mongodb":
+            query_str = {
+                "collection": f"{table_name}",
+                "action": "distinct",
+                "field": date_col
+            }
+            res = self._query(query_str)
+        
+        return pd.DatetimeIndex(res)
+    
+    def _table_tickers(self, table_name):
+        if table_name not in self._table_ticker_cache:
+            self._table_ticker_cache[table_name] = frozenset(self._get_table_ticker(table_name))
+        return self._table_ticker_cache[table_name]
+    
+    def _insert_df_chunked(self, df, table_name, chunksize=None):
+        """Insert `df` in slices of `chunksize` rows, defaults to the backend's INSERT_CHUNK_SIZE."""
+
+        chunksize = self.INSERT_CHUNK_SIZE[self.database] if chunksize is None else chunksize
+        for i in range(0, len(df), chunksize):
+            self._insert_df_to_table(df.iloc[i:i + chunksize], table_name)
+
     def _insert_df_to_table(self, df, table_name):
 
+        self._table_ticker_cache.pop(table_name, None)
+
         if self.database == "chdb":
-            # Convert DataFrame to list of tuples
-            records = [tuple(x) for x in df.to_numpy()]
-            # format_records = ", ".join(str(tuple(row)) for row in records)
-            format_records = ", ".join(
-                                    f"({','.join(['NULL' if v is None else repr(v) for v in record])})"
-                                    for record in records
-                                )
-            # Get columns from DataFrame
+            # chdb's Python() table function scans the Arrow buffers of a
+            # local variable directly, no per-cell repr or SQL VALUES parsing.
+            # The name is only referenced inside the query string, chdb finds
+            # it by inspecting this frame, so it must stay a local here.
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)  # noqa: F841
             columns = ", ".join(df.columns)
-            # Insert data into database
-            self._query(f"""
-                        INSERT INTO {table_name} ({columns}) 
-                        VALUES {format_records};
-                        """)
+            self.db.query(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM Python(arrow_table)")
         
         if self.database == "duckdb":
-            with duckdb.connect(self.db) as conn:
-                df.to_sql(table_name, conn, chunksize=1000000, if_exists="append", index=False)
+            # scan the DataFrame in place instead of going through row-wise inserts
+            columns = ", ".join(df.columns)
+            with self.db.cursor() as cursor:
+                cursor.register("df_view", df)
+                cursor.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM df_view")
         
         if self.database == "mongodb":
             docs = df.to_dict(orient="records")
             query_str = {
                 "collection": f"{table_name}",
                 "action": "insert_many",
-                "documents": docs
+                "documents": docs,
+                "ordered": False
             }
             self._query(query_str)
 
+    def _fetch_generic(self, spec, table_name, update=False, **fetch_kwargs):
+        """
+        Create the table described by `spec` if needed, then fetch every ticker
+        with `spec.fetch_method` and insert the results.
+
+        On update, tickers already in the table are fetched from their next
+        date on, and tickers of `self.ticker_list` not yet stored are fetched in
+        full. Otherwise tickers already in the table are skipped.
+        """
+        self._ensure_table(table_name, spec)
+
+        def fetch(ticker, feed, **kwargs):
+            return getattr(feed, spec.fetch_method)(**fetch_kwargs, **kwargs)
+
+        # Incremental update based on existing data
+        if update:
+            if self._check_table_empty(table_name):
+                raise LookupError(f"Table is empty, insert data into table {table_name} first!")
+            table_tickers = self._table_tickers(table_name)
+            data_feeds = self._load_datafeed(list(table_tickers), update=True, table_name=table_name, date_col=spec.date_col)
+            if spec.update_cutoff:
+                # feed.START already holds the next date after the stored one
+                update_fetch = lambda ticker, feed: fetch(ticker, feed, update=True, cutoff=feed.START)
+            else:
+                update_fetch = lambda ticker, feed: fetch(ticker, feed, update=True)
+            self._fetch_and_insert(table_name, data_feeds, update_fetch, "Incremeantal fetch:")
+
+            # for tickers other than existing ticker
+            extra_data_feeds = self._load_datafeed(list(self._ticker_set - table_tickers), end_date=self.TODAY)
+            self._fetch_and_insert(table_name, extra_data_feeds, fetch, "Incremeantal extra fetch:")
+
+            logger.info(f"{table_name} data update completed.")
+        else:
+            # Perform data extraction, transformation and insertion in a loop
+            existing = self._table_tickers(table_name)
+            pending = [(ticker, feed) for ticker, feed in self.data_feeds if ticker not in existing]
+            self._fetch_and_insert(table_name, pending, fetch, "Normal fetch:")
+            logger.info(f"{table_name} data insertion completed.")
+    
+    def _ensure_table(self, table_name, spec):
+        """Create the table described by `spec` if it does not exist, checked once per manager."""
+
+        if table_name in self._ensured_tables:
+            return
+        if not self._check_table_exists(table_name):
+            if self.database == "mongodb":
+                self.db.create_collection(table_name)
+                if spec.mongo_index:
+                    query_str = {
+                        "collection": f"{table_name}",
+                        "action": "create_index",
+                        "index_fields": list(spec.mongo_index),
+                        "unique": True
+                    }
+                    self._query(query_str)
+            else:
+                self._query(spec.ddl_for(self.database).format(table_name=table_name))
+            logger.info(f"Created table {table_name}, storing {' '.join(table_name.split('_'))} {spec.description}.")
+        self._ensured_tables.add(table_name)
+    
+    def _fetch_and_insert(self, table_name, pairs, fetch, desc):
+        """Fetch every (key, feed) pair concurrently and bulk insert the non-empty results."""
+        pairs = list(pairs)
+        frames = []
+        # throttled redraws, a refresh per fetched item costs more than the loop body
+        progress = tqdm(self._fetch_concurrently(pairs, fetch), total=len(pairs), desc=desc, mininterval=0.5, miniters=50)
+        for key, data in progress:
+            if not self._check_validity(data):
+                logger.warning(f"Table {table_name}, {key} data is empty.")
+                continue
+            frames.append(data)
+            if len(frames) >= self.INSERT_BATCH_SIZE:
+                self._insert_frames(frames, table_name)
+        self._insert_frames(frames, table_name)
+    
+    def _fetch_concurrently(self, pairs, fetch):
+        """
+        Run `fetch(key, feed)` for every (key, feed) pair on a thread pool and
+        yield (key, data) in input order. Network latency rather than the
+        rate limit dominates a sequential loop, the shared `rate_limiter` on
+        the feed methods still caps the overall call rate.
+        """
+        pairs = iter(pairs)
+        # at most 2 * FETCH_WORKERS fetches in flight, so fetched frames never
+        # pile up ahead of the consumer
+        window = 2 * self.FETCH_WORKERS
+        executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+        pending = deque()
+        try:
+            for key, feed in islice(pairs, window):
+                pending.append((key, executor.submit(fetch, key, feed)))
+            while pending:
+                key, future = pending.popleft()
+                data = future.result()
+                for next_key, next_feed in islice(pairs, 1):
+                    pending.append((next_key, executor.submit(fetch, next_key, next_feed)))
+                yield key, data
+        finally:
+            # an insert error or an early stop drops the queued fetches
+            executor.shutdown(cancel_futures=True)
+    
+    def _insert_frames(self, frames, table_name):
+        """Concatenate the buffered frames into one bulk insert and clear the buffer."""
+        if not frames:
+            return
+        data = pd.concat(frames, ignore_index=True)
+        frames.clear()
+        self._insert_df_chunked(data, table_name)
     
     def _delete_table(self, table_name):
+        self._table_ticker_cache.pop(table_name, None)
+        self._ensured_tables.discard(table_name)
+        # a refill with the same row count would otherwise hit the old entries
+        _TABLE_META_CACHE.clear(self._table_meta_endpoint(table_name))
         if self.database != "mongodb":
             try:
                 self._query(f"DROP TABLE IF EXISTS {table_name}")
@@ -842,7 +931,7 @@ class DataFeedManager:
             }
             self._query(query_str)
     
-    def _query(self, query_str: Union[str, Dict], fmt=None):
+    def _query(self, query_str: Union[str, Dict], fmt=None, params=None):
         """
         Execute query and return results in specified format.
         
@@ -850,7 +939,8 @@ class DataFeedManager:
             query_str: SQL query string or Mongo query dictionary
             fmt: Return format
                 - For chdb: "CSV" (default) or "Arrow"
-                - For duckdb: "dataframe" (default), "list" or "tuple"
+                - For duckdb: "dataframe" (default), "arrow", "list" or "tuple"
+            params: Values bound to the `?` placeholders of a duckdb query
         
         Returns:
             Query results in specified format or None for non-SELECT queries
@@ -866,17 +956,20 @@ class DataFeedManager:
         if self.database == "duckdb":
             if fmt is None:
                 fmt = "dataframe"
-            if fmt not in ["dataframe", "list", "tuple"]:
-                raise ValueError(f"duckdb only supports 'dataframe', 'list' or 'tuple' format, got '{fmt}'")
-            with duckdb.connect(self.db) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query_str)
-                # Use regex to identify SELECT queries
-                if not re.match(r'^\s*SELECT', query_str, re.IGNORECASE):
+            if fmt not in ["dataframe", "arrow", "list", "tuple"]:
+                raise ValueError(f"duckdb only supports 'dataframe', 'arrow', 'list' or 'tuple' format, got '{fmt}'")
+            # parallel_task runs several fetch methods on one manager, a cursor
+            # per call keeps the shared connection thread-safe
+            with self.db.cursor() as cursor:
+                cursor.execute(query_str, params)
+                # Identify SELECT queries by their leading keyword
+                if query_str.lstrip()[:6].upper() != "SELECT":
                     return None
                 try:
                     if fmt == "dataframe":
                         return cursor.fetch_df()
+                    elif fmt == "arrow":
+                        return cursor.fetch_arrow_table()
                     elif fmt == "list":
                         return cursor.fetchall()
                     elif fmt == "tuple":
@@ -912,12 +1005,15 @@ class DataFeedManager:
                 elif action == "insert_many":
                     # Insert many action
                     documents = query_str["documents"]
-                    res = collection.insert_many(documents)
+                    ordered = query_str.get("ordered", True)
+                    res = collection.insert_many(documents, ordered=ordered)
                 
                 elif action == "aggregate":
                     # Aggregate action
-                    agg_query = [query_str.get("aggregate", {})]
-                    res = list(collection.aggregate(agg_query))
+                    # a single stage or a full pipeline
+                    agg_query = query_str.get("aggregate", {})
+                    pipeline = agg_query if isinstance(agg_query, list) else [agg_query]
+                    res = list(collection.aggregate(pipeline))
                 
                 elif action == "drop_collection":
                     # Drop collection action
@@ -928,11 +1024,22 @@ class DataFeedManager:
                     filter_query = query_str.get("filter", {})
                     res = collection.count_documents(filter_query)
                 
+                elif action == "estimated_document_count":
+                    # Collection metadata count, no scan
+                    res = collection.estimated_document_count()
+                
                 elif action == "distinct":
                     # Distinct action
                     field = query_str["field"]
                     res = collection.distinct(field)
 
+            except errors.BulkWriteError as e:
+                # unordered inserts go on past duplicate keys, anything else is a real failure
+                write_errors = e.details.get("writeErrors", [])
+                if any(err.get("code") != 11000 for err in write_errors):
+                    raise
+                logger.warning(f"Collection {collection_name}, skipped {len(write_errors)} duplicate documents.")
+                res = e.details
             except errors.PyMongoError as e:
                 print(f"Error executing MongoDB operation: {e}")
                 res = None
@@ -943,56 +1050,69 @@ class DataFeedManager:
             return res
     
     def _check_validity(self, data):
-        try:
-            if data.empty:
-                return False
-        except:
-            if data is None:
-                return False
-        else:
-            return True
+        return data is not None and not data.empty
     
     def _init_duckdb(self):
         assert self.database == "duckdb"
         self._query("CREATE TABLE IF NOT EXISTS init (id VARCHAR PRIMARY KEY,)")
     
-    def _get_table_date(self, table_name, latest=False) -> Union[pd.DataFrame, pd.Timestamp]:
+    def _get_table_date(self, table_name, latest=False, date_col=None) -> Union[pd.DataFrame, pd.Timestamp]:
         
-        date_col = "ex_date" if table_name == "stock_dividend" else "trade_date"
+        if date_col is None:
+            date_col = "ex_date" if table_name == "stock_dividend" else "trade_date"
+        if latest:
+            return self._scan_table_date(table_name, latest, date_col)
+        scan = lambda: self._scan_table_date(table_name, latest, date_col)
+        return self._cached_table_meta("table_date", table_name, scan, date_col)
+    
+    def _scan_table_date(self, table_name, latest, date_col) -> Union[pd.DataFrame, pd.Timestamp]:
         
-        if self.database == "duckdb":
-            query_str = f"SELECT ts_code, MAX({date_col}) AS max_date FROM {table_name} GROUP BY ts_code"
+        if self.database in ("chdb", "duckdb"):
+            if latest:
+                # only the overall maximum is needed, skip the per-ticker grouping
+                query_str = f"SELECT MAX({date_col}) AS max_date FROM {table_name}"
+            else:
+                query_str = f"SELECT ts_code, MAX({date_col}) AS max_date FROM {table_name} GROUP BY ts_code"
         
         if self.database == "mongodb":
-            query_str = {
-                "collection": f"{table_name}",
-                "action": "aggregate",
-                "aggregate": {
+            if latest:
+                aggregate = {
                     "$group": {
-                        "_id": "$ts_code", 
+                        "_id": None, 
                         "max_date": {"$max": f"${date_col}"}}
                 }
+            else:
+                # sorting in reverse order of the unique (ts_code, date) index and
+                # taking the first date lets mongodb answer with a DISTINCT_SCAN,
+                # one index seek per ticker instead of reading every document
+                aggregate = [
+                    {"$sort": {"ts_code": -1, date_col: -1}},
+                    {"$group": {"_id": "$ts_code", "max_date": {"$first": f"${date_col}"}}}
+                ]
+            query_str = {
+                "collection": f"{table_name}",
+                "action": "aggregate",
+                "aggregate": aggregate
             }
         
-        table_date = self._query(query_str, fmt="dataframe")
+        if self.database == "chdb":
+            table_date = chdb.to_df(self._query(query_str, "Arrow"))
+        else:
+            table_date = self._query(query_str, fmt="dataframe")
 
         if latest:
             table_date = table_date["max_date"].max()
         
         return table_date
     
-    def _get_ticker_date(self, table_date, ticker, shift=0) -> str:
-
-        if self.database == "mongodb":
-            ticker_date = table_date[table_date["_id"]==ticker]["max_date"].iloc[0]
-        if self.database == "duckdb":
-            ticker_date = table_date[table_date["ts_code"]==ticker]["max_date"].iloc[0]
-
-        if isinstance(ticker_date, pd.Timestamp):
-            ticker_date = (ticker_date + datetime.timedelta(shift)).strftime("%Y%m%d")
-        if isinstance(ticker_date, str):
-            ticker_date = (datetime.datetime.strptime(ticker_date, "%Y%m%d") + datetime.timedelta(shift)).strftime("%Y%m%d")
+    def _get_ticker_dates(self, table_date, shift=0) -> Dict[str, str]:
+        """Map every ticker in `table_date` to its latest date shifted by `shift` days, as `YYYYmmdd`."""
 
-        return ticker_date
+        ticker_col = "_id" if self.database == "mongodb" else "ts_code"
+        max_date = table_date["max_date"]
+        if not pd.api.types.is_datetime64_any_dtype(max_date):
+            max_date = pd.to_datetime(max_date, format="%Y%m%d")
+        ticker_date = (max_date + pd.Timedelta(days=shift)).dt.strftime("%Y%m%d")
 
+        return dict(zip(table_date[ticker_col], ticker_date))
 
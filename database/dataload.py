@@ -12,18 +12,30 @@ from chdb.session import Session
 from pymongo import MongoClient
 
 from ..basis import frozen_config
-from .base import connection_factory
+from .base import connection_factory, shared_duckdb
 
 # calculate extra dates for alphas to ensure valid value from start_date
 START_EXT = (datetime.strptime(frozen_config.start_date, "%Y%m%d") - relativedelta(months=6)).strftime("%Y-%m-%d")
 END = datetime.strptime(frozen_config.end_date, "%Y%m%d").strftime("%Y-%m-%d")
 
+# alternative data table kinds, matched against the table name
+_LIST_RE = re.compile(r"list|delist", re.IGNORECASE)
+_DIVIDEND_RE = re.compile(r"dividend", re.IGNORECASE)
+_SUSPEND_RE = re.compile(r"suspend", re.IGNORECASE)
+
 
 class DataLoader(ABC):
     """
     DataLoader is designed for loading raw data from original data source.
     """
 
+    # float32 halves the memory of loaded frames but is lossy for prices
+    # and amounts, keep it opt-in
+    DOWNCAST_FLOAT = False
+    # keep duckdb results in Arrow-backed columns (pd.ArrowDtype) instead of
+    # converting them to numpy, strings stay out of object dtype
+    ARROW_DTYPES = False
+
     def __init__(self, database):
 
         self.database = database
@@ -49,7 +61,7 @@ class DataLoader(ABC):
         
         raise NotImplementedError
     
-    def _query(self, query_str: Union[str, Dict], fmt=None):
+    def _query(self, query_str: Union[str, Dict], fmt=None, params=None):
 
         if self.database == "chdb":
             if fmt is None:
@@ -61,15 +73,21 @@ class DataLoader(ABC):
         if self.database == "duckdb":
             if fmt is None:
                 fmt = "dataframe"
-            if fmt not in ["dataframe"]:
-                raise ValueError(f"duckdb only supports 'dataframe' format, got '{fmt}'")
-            with duckdb.connect(self.db, read_only=True) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query_str)
-                # Use regex to identify SELECT queries
-                if not re.match(r'^\s*SELECT', query_str, re.IGNORECASE):
+            if fmt not in ["dataframe", "arrow"]:
+                raise ValueError(f"duckdb only supports 'dataframe' or 'arrow' format, got '{fmt}'")
+            # reuse a DataFeedManager's live connection to the file, otherwise open
+            # read-only per query so the file is never held locked between loads
+            conn = shared_duckdb(self.db)
+            with (conn.cursor() if conn is not None else duckdb.connect(self.db, read_only=True)) as cursor:
+                cursor.execute(query_str, params)
+                # Identify SELECT queries by their leading keyword
+                if query_str.lstrip()[:6].upper() != "SELECT":
                     return None
                 try:
+                    if fmt == "arrow":
+                        return cursor.fetch_arrow_table()
+                    if self.ARROW_DTYPES:
+                        return cursor.fetch_arrow_table().to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
                     return cursor.fetchdf()
                 except Exception as e:
                     print(f"Error fetching data: {e}")
@@ -89,8 +107,14 @@ class DataLoader(ABC):
             
             return res
     
+    def _reduce_mem_usage(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Cast float columns to float32 when `DOWNCAST_FLOAT` is on, the feed tables hold no integer columns."""
+
+        float_cols = [c for c in data.columns if pd.api.types.is_float_dtype(data[c])]
+        return data.astype(dict.fromkeys(float_cols, "float32"))
+    
     def _check_validity(self, data):
-        if data.empty or data is None:
+        if data is None or data.empty:
             # Data incompleteness
             raise ValueError(f"Missing data detected. Please check the integrity of {self.database} database entries.")
 
@@ -149,7 +173,8 @@ class TSDataLoader(DataLoader):
         table_name: str,
         universe: Tuple,
         start_date: str = None,
-        end_date: str = None
+        end_date: str = None,
+        col: Union[str, Tuple] = None
     ) -> pd.DataFrame:
 
         if not universe:
@@ -170,12 +195,18 @@ class TSDataLoader(DataLoader):
         else:
             _start_date, _end_date = start_date, end_date
 
+        # only read the requested columns besides the index keys
+        cols = None if col is None else [col] if isinstance(col, str) else list(col)
+
+        params = None
         if self.database == "duckdb":
+            col_sql = "*" if cols is None else ", ".join(["ts_code", "trade_date", *cols])
             query_str = f"""
-                        SELECT * FROM {table_name} 
-                        WHERE ts_code IN {universe} AND trade_date >= '{_start_date}' AND trade_date <= '{_end_date}' 
-                        ORDER BY trade_date DESC
+                        SELECT {col_sql} FROM {table_name} 
+                        WHERE ts_code IN (SELECT UNNEST(?)) AND trade_date >= ? AND trade_date <= ? 
+                        ORDER BY ts_code, trade_date
                         """
+            params = [list(universe), _start_date, _end_date]
         if self.database == "mongodb":
             _start_date = datetime.strptime(_start_date, "%Y-%m-%d")
             _end_date = datetime.strptime(_end_date, "%Y-%m-%d")
@@ -183,7 +214,9 @@ class TSDataLoader(DataLoader):
                 "collection": f"{table_name}",
                 "filter": {"ts_code": {"$in": list(universe)}, "trade_date": {"$gte": _start_date, "$lte": _end_date}}
             }
-        data = self._query(query_str)
+            if cols is not None:
+                query_str["projection"] = dict.fromkeys(["ts_code", "trade_date", *cols], 1)
+        data = self._query(query_str, params=params)
         self._check_validity(data)
 
         return data
@@ -194,7 +227,8 @@ class TSDataLoader(DataLoader):
         table_name: str,
         universe: Tuple = (),
         start_date: str = None,
-        end_date: str = None
+        end_date: str = None,
+        col: Union[str, Tuple] = None
     ) -> pd.DataFrame:
         """
         Transform data into multi-index format
@@ -202,14 +236,19 @@ class TSDataLoader(DataLoader):
         - level_1: trade_date
         """
 
-        data = self._data_loader(table_name, universe, start_date, end_date)
+        data = self._data_loader(table_name, universe, start_date, end_date, col)
         if self.database == "mongodb":
             del data["_id"]
-        # drop duplicated rows
-        data.drop_duplicates(keep="first", inplace=True)
+            # drop duplicated rows, duckdb tables are unique on (ts_code, trade_date)
+            # through their primary key so rows never repeat there
+            data.drop_duplicates(keep="first", inplace=True)
+        if self.DOWNCAST_FLOAT:
+            data = self._reduce_mem_usage(data)
         # data transformation
         data.set_index(["ts_code", "trade_date"], inplace=True)
-        data.sort_index(level=0, ascending=True, inplace=True)
+        # duckdb already returns rows in index order, only sort what is not
+        if not data.index.is_monotonic_increasing:
+            data.sort_index(level=0, ascending=True, inplace=True)
 
         return data
     
@@ -228,7 +267,7 @@ class TSDataLoader(DataLoader):
         dataframe.
         """
 
-        data = self._data_transformer(table_name, universe, start_date, end_date)
+        data = self._data_transformer(table_name, universe, start_date, end_date, col)
 
         # data selection
         if col is None:
@@ -239,7 +278,10 @@ class TSDataLoader(DataLoader):
         if isinstance(col, str):
             return data_sel.swaplevel().unstack().ffill()
         elif isinstance(col, tuple):
-            return tuple(data_sel[c].swaplevel().unstack().ffill() for c in col)
+            # swap and unstack the index once for all columns, wide[c] is
+            # the (trade_date x ts_code) panel of column c
+            wide = data_sel.swaplevel().unstack().ffill()
+            return tuple(wide[c] for c in col)
         else:
             raise TypeError("Not supportable type for columns! Only string or tuple is allowed.")
 
@@ -272,13 +314,13 @@ class AltDataLoader(DataLoader):
             end_date: str = None
         ) -> pd.DataFrame:
         
-        if re.search(r"list|delist", table_name, re.IGNORECASE):
+        if _LIST_RE.search(table_name):
             data = self._basic_loader(table_name)
         
-        elif re.search(r"dividend", table_name, re.IGNORECASE):
+        elif _DIVIDEND_RE.search(table_name):
             data = self._dividend_loader(table_name, universe)
         
-        elif re.search(r"suspend", table_name, re.IGNORECASE):
+        elif _SUSPEND_RE.search(table_name):
             data = self._suspend_loader(table_name, start_date, end_date)
 
         return data
@@ -311,15 +353,17 @@ class AltDataLoader(DataLoader):
         if not universe:
             raise ValueError("arg `universe` must not be none.")
 
+        params = None
         if self.database == "duckdb":
-            query_str = f"SELECT * FROM {table_name} WHERE ts_code IN {universe}"
+            query_str = f"SELECT * FROM {table_name} WHERE ts_code IN (SELECT UNNEST(?))"
+            params = [list(universe)]
         if self.database == "mongodb":
             query_str = {
                 "collection": f"{table_name}",
                 "filter": {"ts_code": {"$in": list(universe)}}
             }
         
-        raw_data = self._query(query_str)
+        raw_data = self._query(query_str, params=params)
         self._check_validity(raw_data)
         data = self._dividend_transformer(raw_data)
 
@@ -342,10 +386,12 @@ class AltDataLoader(DataLoader):
         start_temp = frozen_config.start_date if start_date is None else start_date
         end_temp = frozen_config.end_date if end_date is None else end_date
 
+        params = None
         if self.database == "duckdb":
             _start_date = pd.to_datetime(start_temp).strftime("%Y-%m-%d")
             _end_date = pd.to_datetime(end_temp).strftime("%Y-%m-%d")
-            query_str = f"SELECT * FROM {table_name} WHERE trade_date>='{_start_date}' AND trade_date<='{_end_date}'"
+            query_str = f"SELECT * FROM {table_name} WHERE trade_date>=? AND trade_date<=?"
+            params = [_start_date, _end_date]
         if self.database == "mongodb":
             _start_date = pd.to_datetime(start_temp)
             _end_date = pd.to_datetime(end_temp)
@@ -354,7 +400,7 @@ class AltDataLoader(DataLoader):
                 "filter": {"trade_date": {"$gte": _start_date, "$lte": _end_date}}
             }
         
-        raw_data = self._query(query_str)
+        raw_data = self._query(query_str, params=params)
         self._check_validity(raw_data)
         data = self._suspend_transformer(raw_data)
 
@@ -0,0 +1,87 @@
+import os
+import time
+import shutil
+import hashlib
+import logging
+import threading
+import pandas as pd
+import pyarrow as pa
+from functools import wraps
+from datetime import timedelta
+
+
+logger = logging.getLogger("frozen")
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "cache")
+
+
+class FileCache:
+    """
+    On-disk cache for fetched DataFrames.
+
+    Each response is stored as `{cache_dir}/{endpoint}/{md5(key)}.parquet`
+    and considered stale once its file is older than `ttl`.
+    """
+
+    def __init__(self, cache_dir=CACHE_PATH, ttl=timedelta(days=1)):
+        self.cache_dir = cache_dir
+        self.ttl = ttl.total_seconds()
+
+    def _path(self, endpoint, key):
+        digest = hashlib.md5(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, endpoint, f"{digest}.parquet")
+
+    def get(self, endpoint, key):
+        path = self._path(endpoint, key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            return pd.read_parquet(path)
+        except (OSError, ValueError):
+            # missing, unreadable or partially written entry
+            return None
+
+    def set(self, endpoint, key, data):
+        path = self._path(endpoint, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, pa.ArrowException) as e:
+            # read-only or full cache dir, or a frame parquet cannot hold,
+            # the data is still returned, only uncached
+            logger.warning(f"Failed to cache {endpoint} response: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self, endpoint):
+        """Drop every entry stored under `endpoint`."""
+        shutil.rmtree(os.path.join(self.cache_dir, endpoint), ignore_errors=True)
+
+
+def cached(key, ttl=timedelta(days=1), cache_dir=CACHE_PATH):
+    """
+    Cache the DataFrame returned by a feed method on disk.
+
+    `key(self, *args, **kwargs)` must return a value whose repr identifies
+    the request. Empty or missing results are never cached.
+    """
+    cache = FileCache(cache_dir, ttl)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache_key = key(self, *args, **kwargs)
+            data = cache.get(func.__name__, cache_key)
+            if data is not None:
+                return data
+            data = func(self, *args, **kwargs)
+            if data is not None and not data.empty:
+                cache.set(func.__name__, cache_key, data)
+            return data
+
+        return wrapper
+    return decorator
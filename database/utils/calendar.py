@@ -3,10 +3,39 @@ import pandas as pd
 import datetime
 import holidays
 import chinese_calendar as cn_calendar
+from functools import lru_cache
 import pandas_market_calendars as mcal
 from dateutil.relativedelta import relativedelta
 
 
+# chinese_calendar only covers the years it ships holiday data for
+_MIN_YEAR, _MAX_YEAR = min(cn_calendar.holidays).year, max(cn_calendar.holidays).year
+# numpy business-day calendar, trade days are weekdays outside the cn holidays
+_WEEKMASK = [day not in holidays.WEEKEND for day in range(7)]
+_TRADE_CALENDAR = np.busdaycalendar(weekmask=_WEEKMASK, holidays=np.array(sorted(cn_calendar.holidays), dtype="datetime64[D]"))
+
+
+def _check_supported(*years):
+    for year in years:
+        if not _MIN_YEAR <= year <= _MAX_YEAR:
+            raise NotImplementedError(f"no available data for year {year}, only year between [{_MIN_YEAR}, {_MAX_YEAR}] supported")
+
+
+@lru_cache(maxsize=8192)
+def _is_tradeday(date):
+    return False if date.weekday() in holidays.WEEKEND or cn_calendar.is_holiday(date) else True
+
+
+@lru_cache(maxsize=64)
+def _trade_days(start_date, end_date):
+    dates = pd.date_range(start_date, end_date)
+    if len(dates) == 0:
+        return pd.DatetimeIndex([])
+    _check_supported(dates[0].year, dates[-1].year)
+    # one vectorized business-day test instead of a holiday lookup per date
+    return pd.DatetimeIndex(dates[np.is_busday(dates.values.astype("datetime64[D]"), busdaycal=_TRADE_CALENDAR)])
+
+
 class Calendar:
     '''The market calendar adjustment module.'''
 
@@ -35,25 +64,29 @@ class Calendar:
     def is_tradeday(self, date):
         '''Decide whether the given date is trade day.'''
 
-        return False if date.weekday() in holidays.WEEKEND or cn_calendar.is_holiday(date) else True
+        return _is_tradeday(date)
 
 
     def get_trade_day(self, start_date, end_date):
-        '''Generate a list of trade days between the given start date and end date.'''
+        '''
+        Generate a list of trade days between the given start date and end date.
+        The index is cached and shared between callers, it must not be modified in place.
+        '''
 
-        return pd.DatetimeIndex([date for date in pd.date_range(start_date, end_date) if self.is_tradeday(date)])
+        return _trade_days(start_date, end_date)
     
 
     @staticmethod
     def next_trade_day(date):
         '''Gives the following trade day after the given date.'''
 
-        date = pd.to_datetime(date) if isinstance(date, str) else date
+        date = pd.Timestamp(date).normalize()
         
-        ONE_DAY = datetime.timedelta(days=1)
-        next_trade_day = date + ONE_DAY
-        while next_trade_day.weekday() in holidays.WEEKEND or cn_calendar.is_holiday(next_trade_day):
-            next_trade_day += ONE_DAY
+        # roll the next day forward to the first trade day, a binary search
+        # over the holiday table instead of a lookup per skipped day
+        next_day = (date + datetime.timedelta(days=1)).to_datetime64().astype("datetime64[D]")
+        next_trade_day = pd.Timestamp(np.busday_offset(next_day, 0, roll="forward", busdaycal=_TRADE_CALENDAR))
+        _check_supported(date.year, next_trade_day.year)
         
         return next_trade_day
 
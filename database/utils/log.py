@@ -1,22 +1,44 @@
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+
+LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "logs")
+
+class FastFormatter(logging.Formatter):
+    """Formatter reusing the formatted timestamp for records in the same second"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_time = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt is None:
+            # default format carries milliseconds, nothing to reuse
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        last_sec, last_str = self._last_time
+        if sec != last_sec:
+            last_str = time.strftime(datefmt, self.converter(sec))
+            self._last_time = (sec, last_str)
+        return last_str
+
 
 class DataLogger:
     """Logger for database to fetch data"""
     
     def __init__(self, log_file_path="datafeed.log"):
         self.log_file_path = log_file_path
+        self.log_file = os.path.join(LOG_PATH, log_file_path)
         self._init_logger()
     
     def _init_logger(self):
-        current_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-        log_path = os.path.join(current_path, "logs")
-        
         # Create log path if it doesn't exist
-        if not os.path.exists(log_path):
-            os.makedirs(log_path)
+        os.makedirs(LOG_PATH, exist_ok=True)
         
         # # Update log file path in the INI configuration
         # config_file = os.path.join(current_path, 'logger_config.ini')
@@ -34,17 +56,22 @@ class DataLogger:
         root_logger = logging.getLogger()
         frozen_logger = logging.getLogger('frozen')
 
-        # Set logger level
-        root_logger.setLevel(logging.INFO)
+        # Configure once per process, another DataLogger would duplicate every line
+        if getattr(frozen_logger, '_configured', False):
+            return
+        frozen_logger._configured = True
+
+        # Set logger level, third-party libraries only reach the console from WARNING
+        root_logger.setLevel(logging.WARNING)
         frozen_logger.setLevel(logging.INFO)
 
         # Define logger formatters
-        simple_formatter = logging.Formatter(
+        simple_formatter = FastFormatter(
             fmt='[%(levelname)s] - %(asctime)s - %(name)s - [%(filename)s:%(lineno)d]: %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
 
-        detailed_formatter = logging.Formatter(
+        detailed_formatter = FastFormatter(
             fmt='[%(process)s:%(threadName)s](%(asctime)s) %(levelname)s - %(name)s - [%(filename)s:%(lineno)d] - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
@@ -55,10 +82,9 @@ class DataLogger:
         console_handler.setFormatter(simple_formatter)
 
         # Create file handler
-        log_file = os.path.join(log_path, self.log_file_path) 
         max_size = 5 * 1024 * 1024   # 5 MB
         file_handler = RotatingFileHandler(
-            filename=log_file,
+            filename=self.log_file,
             mode="a",
             maxBytes=max_size,
             backupCount=3
@@ -66,12 +92,38 @@ class DataLogger:
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(detailed_formatter)
 
+        # Write and rotate the file on a background thread, callers only enqueue
+        self._file_handler = file_handler
+        self._queue_handler = QueueHandler(queue.Queue(-1))
+
         # Add handlers to loggers
         root_logger.addHandler(console_handler)
         frozen_logger.addHandler(console_handler)
-        frozen_logger.addHandler(file_handler)
+        frozen_logger.addHandler(self._queue_handler)
 
         frozen_logger.propagate = False
 
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        # a forked child inherits the queue but not the listener thread
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._write_directly)
+
+    def _start_listener(self):
+        self._listener = QueueListener(self._queue_handler.queue, self._file_handler, respect_handler_level=True)
+        self._listener.start()
+
+    def _stop_listener(self):
+        if self._listener is not None:
+            self._listener.stop()
+
+    def _write_directly(self):
+        # worker processes often leave through os._exit, skipping atexit, so a
+        # child writes synchronously instead of running its own listener
+        frozen_logger = logging.getLogger('frozen')
+        frozen_logger.removeHandler(self._queue_handler)
+        frozen_logger.addHandler(self._file_handler)
+        self._listener = None
+
 
 L = DataLogger()
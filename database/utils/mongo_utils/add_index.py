@@ -1,18 +1,28 @@
-from pymongo import MongoClient
-
-def create_indexes():
-    client = MongoClient(host='localhost', port=27017)
-    db = client.FrozenBacktest 
-    collections = [
-        'index_daily', 
-        'stock_daily_real', 
-        'stock_daily_hfq', 
-        'stock_daily_limit',
-        'stock_fundamental',
-    ]
-    for collection in collections:
-        db[collection].create_index([('ts_code', 1), ('trade_date', 1)], background=True)
-        print(f"Index created for {collection}")
-
-if __name__ == '__main__':
-    create_indexes()
+from pymongo import MongoClient, IndexModel
+from concurrent.futures import ThreadPoolExecutor
+
+# one pooled, thread-safe client shared by every worker; connect=False defers
+# the connection and minPoolSize threads until the first operation
+_CLIENT = MongoClient(host='localhost', port=27017, maxPoolSize=32, minPoolSize=4, waitQueueTimeoutMS=5000, socketTimeoutMS=60000, connect=False)
+
+def create_indexes():
+    collections = [
+        'index_daily', 
+        'stock_daily_real', 
+        'stock_daily_hfq', 
+        'stock_daily_limit',
+        'stock_fundamental',
+    ]
+    db = _CLIENT.FrozenBacktest 
+    index = IndexModel([('ts_code', 1), ('trade_date', 1)], background=True)
+
+    def create_index(collection):
+        db[collection].create_indexes([index])
+        return collection
+
+    with ThreadPoolExecutor(max_workers=len(collections)) as executor:
+        created = list(executor.map(create_index, collections))
+    print(f"Index created for {', '.join(created)}")
+
+if __name__ == '__main__':
+    create_indexes()
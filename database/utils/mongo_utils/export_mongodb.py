@@ -1,75 +1,133 @@
-import os
-import subprocess
-from pymongo import MongoClient
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
-
-
-def find_mongodb_tools_path(root_dir, folder_name="mongodb-database-tools-macos-arm64-100.10.0"):
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        if folder_name in dirnames:
-            return os.path.join(dirpath, folder_name)
-    return None
-
-def get_all_collections(db):
-    return db.list_collection_names()
-
-def export_collection_to_bson(db_name, collection, host, port, mongodump_path, export_directory):
-    export_command = [
-        mongodump_path,
-        "--host", host,
-        "--port", str(port),
-        "--db", db_name,
-        "--collection", collection,
-        "--out", export_directory
-    ]
-
-    print(f"Execute command: {" ".join(export_command)}")
-    result = subprocess.run(export_command, executable=mongodump_path)
-    if result.returncode != 0:
-        print(f"Error when exporting collection {collection}")
-
-def export_collections_to_bson(db_name, exclude_collections, include_collections, mongodump_path, export_directory, max_workers=4):
-    
-    host = "localhost"
-    port = 27017
-    client = MongoClient(host=host, port=port)
-    db = client[db_name]
-    collections = get_all_collections(db)
-
-    if include_collections:
-        collections_to_export = [col for col in collections if col in include_collections]
-    else:
-        collections_to_export = [col for col in collections if col not in exclude_collections]
-
-    with ThreadPoolExecutor(max_workers) as executor:
-        futures = {
-            executor.submit(export_collection_to_bson, db_name, collection, host, port, mongodump_path, export_directory): collection 
-            for collection in collections_to_export
-        }
-        for future in tqdm(as_completed(futures), total=len(futures), desc="Export progress"):
-            future.result()
-
-    print("All collections have been exported.")
-
-
-if __name__ == "__main__":
-    
-    db_name = "FrozenBacktest"
-    exclude_collections = []
-    include_collections = []
-
-    # auto search "mongodb-database-tools" file path
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    mongodb_tools_path = find_mongodb_tools_path(current_dir)
-
-    if mongodb_tools_path is None:
-        print('"mongodb-database-tools" folder not found, please check directory strcture.')
-    else:
-        mongodump_path = os.path.join(mongodb_tools_path, "bin", "mongodump.exe")
-        export_directory = os.path.join(current_dir, "exports")
-
-        if not os.path.exists(export_directory):
-            os.makedirs(export_directory)
-
-        export_collections_to_bson(db_name, exclude_collections, include_collections, mongodump_path, export_directory)
+import os
+import subprocess
+from functools import lru_cache
+from pymongo import MongoClient
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+try:
+    from .tools_cache import cached_tool_path
+except ImportError:
+    # run as a script from this directory
+    from tools_cache import cached_tool_path
+
+
+_THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# one pooled, thread-safe client shared by every worker; connect=False defers
+# the connection and minPoolSize threads until the first operation
+_CLIENT = MongoClient(host="localhost", port=27017, maxPoolSize=32, minPoolSize=4, waitQueueTimeoutMS=5000, socketTimeoutMS=60000, connect=False)
+
+
+def find_mongodb_tools_path(root_dir, folder_name="mongodb-database-tools-macos-arm64-100.10.0"):
+    # the tools usually sit next to the script, one stat settles that case
+    candidate = os.path.join(root_dir, folder_name)
+    if os.path.isdir(candidate):
+        return candidate
+
+    # depth-first scandir, d_type from readdir saves a stat per entry,
+    # and the search stops at the first match
+    stack = [root_dir]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # unreadable directory, skip it as os.walk did
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if not entry.is_dir(follow_symlinks=False) or entry.name.startswith("."):
+                        continue
+                except OSError:
+                    continue
+                if entry.name == folder_name:
+                    return entry.path
+                stack.append(entry.path)
+    return None
+
+@lru_cache(maxsize=None)
+def _find_tool(root_dir, folder_name="mongodb-database-tools-macos-arm64-100.10.0"):
+    return cached_tool_path(root_dir, folder_name, find_mongodb_tools_path, os.path.isdir)
+
+def get_all_collections(db):
+    return db.list_collection_names()
+
+def partition_collections(collection_sizes, n_buckets):
+    # largest first, each collection goes to the currently lightest bucket
+    buckets = [[] for _ in range(n_buckets)]
+    loads = [0] * n_buckets
+    for collection, size in sorted(collection_sizes.items(), key=lambda x: x[1], reverse=True):
+        i = loads.index(min(loads))
+        buckets[i].append(collection)
+        loads[i] += size
+    return [bucket for bucket in buckets if bucket]
+
+def export_collection_to_bson(db_name, collections, exclude_collections, host, port, mongodump_path, export_directory, verbose=False):
+    # one compressed sequential file per bucket instead of a file pair per collection
+    archive_path = os.path.join(export_directory, db_name, f"{collections[0]}.archive.gz")
+    # mongodump has no include filter, so a bucket is everything else excluded
+    export_command = [
+        mongodump_path,
+        "--host", host,
+        "--port", str(port),
+        "--db", db_name,
+        *(arg for collection in exclude_collections for arg in ("--excludeCollection", collection)),
+        "--numParallelCollections", str(len(collections)),
+        f"--archive={archive_path}",
+        "--gzip"
+    ]
+
+    if verbose:
+        tqdm.write(f"Execute command: {' '.join(export_command)}")
+    # keep mongodump's output off the terminal so it does not fight the progress bar
+    proc = subprocess.Popen(export_command, executable=mongodump_path, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, err = proc.communicate()
+    if proc.returncode != 0:
+        tqdm.write(f"Error when exporting collections {', '.join(collections)}: {err.decode(errors='replace')[-500:]}")
+
+def export_collections_to_bson(db_name, exclude_collections, include_collections, mongodump_path, export_directory, max_workers=4, verbose=False):
+    
+    host = "localhost"
+    port = 27017
+    db = _CLIENT[db_name]
+    collections = get_all_collections(db)
+
+    if include_collections:
+        collections_to_export = [col for col in collections if col in include_collections]
+    else:
+        collections_to_export = [col for col in collections if col not in exclude_collections]
+
+    # one mongodump per bucket of similar total size instead of one per collection
+    collection_sizes = {col: db[col].estimated_document_count() for col in collections_to_export}
+    buckets = partition_collections(collection_sizes, max_workers)
+    os.makedirs(os.path.join(export_directory, db_name), exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {}
+        for bucket in buckets:
+            bucket_exclude = [col for col in collections if col not in bucket]
+            future = executor.submit(export_collection_to_bson, db_name, bucket, bucket_exclude, host, port, mongodump_path, export_directory, verbose)
+            futures[future] = bucket
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Export progress"):
+            future.result()
+
+    print("All collections have been exported.")
+
+
+if __name__ == "__main__":
+    
+    db_name = "FrozenBacktest"
+    exclude_collections = []
+    include_collections = []
+
+    # auto search "mongodb-database-tools" file path
+    mongodb_tools_path = _find_tool(_THIS_DIR)
+
+    if mongodb_tools_path is None:
+        print('"mongodb-database-tools" folder not found, please check directory strcture.')
+    else:
+        mongodump_path = os.path.join(mongodb_tools_path, "bin", "mongodump.exe")
+        export_directory = os.path.join(_THIS_DIR, "exports")
+        os.makedirs(export_directory, exist_ok=True)
+
+        export_collections_to_bson(db_name, exclude_collections, include_collections, mongodump_path, export_directory)
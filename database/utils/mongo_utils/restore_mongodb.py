@@ -1,60 +1,185 @@
-import os
-import subprocess
-
-host = "localhost"
-port = 27017
-
-def restore_mongodb(db_name, backup_dir):
-    # retrieve all .bson files
-    bson_files = [f for f in os.listdir(backup_dir) if f.endswith('.bson')]
-    
-    # auto check mongorestore file path
-    mongorestore_path = None
-    for root, dirs, files in os.walk(os.path.dirname(os.path.realpath(__file__))):
-        if 'mongorestore.exe' in files:
-            mongorestore_path = os.path.join(root, 'mongorestore.exe')
-            break
-
-    if not mongorestore_path:
-        raise FileNotFoundError('"mongorestore.exe" not found, please make sure "mongodb-database-tools" folder has the same level as the current script.')
-
-    for bson_file in bson_files:
-        collection_name = bson_file.split('.')[0]  # extract collection names
-        metadata_file = os.path.join(backup_dir, f"{collection_name}.metadata")
-        
-        # make up mongorestore commands
-        restore_command = [
-            mongorestore_path,
-            "--host", host,
-            "--port", str(port),
-            "--db", db_name,
-            "--collection", collection_name,
-            os.path.join(backup_dir, bson_file)
-        ]
-        
-        # execute mongorestore command
-        print(f"Execute command: {" ".join(restore_command)}")
-        subprocess.run(restore_command)
-        
-        # if .metadata file exists, also restore
-        if os.path.exists(metadata_file):
-            restore_metadata_command = [
-                mongorestore_path,
-                "--host", host,
-                "--port", str(port),
-                "--db", db_name,
-                "--collection", collection_name,
-                metadata_file
-            ]
-            print(f"Execute command: {" ".join(restore_metadata_command)}")
-            subprocess.run(restore_metadata_command)
-
-
-if __name__ == "__main__":
-    
-    database_name = "FactorBase"  # substitute for target database storage name
-    # retrieve directory of current script
-    current_directory = os.path.dirname(os.path.realpath(__file__))
-    # set export directory
-    backup_directory = os.path.join(current_directory, "exports", database_name) 
-    restore_mongodb(database_name, backup_directory)
+import os
+import glob
+import subprocess
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+try:
+    from .tools_cache import cached_tool_path
+except ImportError:
+    # run as a script from this directory
+    from tools_cache import cached_tool_path
+from bson import decode_file_iter
+from pymongo import MongoClient, WriteConcern
+from pymongo.errors import BulkWriteError
+
+host = "localhost"
+port = 27017
+
+_THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# one pooled, thread-safe client shared by every worker; connect=False defers
+# the connection and minPoolSize threads until the first operation
+_CLIENT = MongoClient(host=host, port=port, maxPoolSize=32, minPoolSize=4, waitQueueTimeoutMS=5000, socketTimeoutMS=60000, connect=False)
+
+def find_file(root_dir, file_name):
+    # the tools usually sit next to the script, whatever their platform and version
+    matches = glob.glob(os.path.join(glob.escape(root_dir), "mongodb-database-tools-*", "bin", glob.escape(file_name)))
+    if matches:
+        return matches[0]
+
+    # depth-first scandir, d_type from readdir saves a stat per entry,
+    # and the search stops at the first match
+    stack = [root_dir]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # unreadable directory, skip it as os.walk did
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name == file_name and entry.is_file():
+                        return entry.path
+                except OSError:
+                    continue
+    return None
+
+@lru_cache(maxsize=None)
+def _find_tool(root_dir, file_name):
+    return cached_tool_path(root_dir, file_name, find_file, os.path.isfile)
+
+def _run(command, verbose):
+    if verbose:
+        tqdm.write(f"Execute command: {' '.join(command)}")
+    # keep mongorestore's output off the terminal so it does not fight the progress bar
+    proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, err = proc.communicate()
+    if proc.returncode != 0:
+        tqdm.write(f"Error when running {command[-1]}: {err.decode(errors='replace')[-500:]}")
+
+def restore_collection(db_name, collection_name, bson_path, metadata_file, mongorestore_path, verbose=False):
+    # make up mongorestore commands
+    restore_command = [
+        mongorestore_path,
+        "--host", host,
+        "--port", str(port),
+        "--db", db_name,
+        "--collection", collection_name,
+        # parallel inserts within the collection as well
+        "--numInsertionWorkersPerCollection", "4",
+        bson_path
+    ]
+    
+    # execute mongorestore command
+    _run(restore_command, verbose)
+    
+    # if .metadata file exists, also restore
+    if os.path.exists(metadata_file):
+        restore_metadata_command = [
+            mongorestore_path,
+            "--host", host,
+            "--port", str(port),
+            "--db", db_name,
+            "--collection", collection_name,
+            metadata_file
+        ]
+        _run(restore_metadata_command, verbose)
+
+def restore_archive(db_name, source_db, archive_path, mongorestore_path, verbose=False):
+    # an archive carries its collections' indexes, no separate metadata pass;
+    # namespaces are renamed so the dump can load into a differently named database
+    restore_command = [
+        mongorestore_path,
+        "--host", host,
+        "--port", str(port),
+        f"--archive={archive_path}",
+        "--gzip",
+        "--nsInclude", f"{source_db}.*",
+        "--nsFrom", f"{source_db}.*",
+        "--nsTo", f"{db_name}.*",
+        "--numInsertionWorkersPerCollection", "4"
+    ]
+    _run(restore_command, verbose)
+
+def restore_mongodb(db_name, backup_dir, max_workers=4, verbose=False):
+    # retrieve all .archive.gz files, or .bson files from older exports
+    archive_files = [f for f in os.listdir(backup_dir) if f.endswith('.archive.gz')]
+    bson_files = [] if archive_files else [f for f in os.listdir(backup_dir) if f.endswith('.bson')]
+    
+    # auto check mongorestore file path
+    mongorestore_path = _find_tool(_THIS_DIR, 'mongorestore.exe')
+
+    if not mongorestore_path:
+        raise FileNotFoundError('"mongorestore.exe" not found, please make sure "mongodb-database-tools" folder has the same level as the current script.')
+
+    # the export writes its archives to exports/<source db>/
+    source_db = os.path.basename(os.path.normpath(backup_dir))
+
+    # collections restore independently, run them concurrently like the export
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {}
+        for archive_file in archive_files:
+            future = executor.submit(restore_archive, db_name, source_db, os.path.join(backup_dir, archive_file), mongorestore_path, verbose)
+            futures[future] = archive_file
+        for bson_file in bson_files:
+            collection_name = bson_file.split('.')[0]  # extract collection names
+            metadata_file = os.path.join(backup_dir, f"{collection_name}.metadata")
+            future = executor.submit(restore_collection, db_name, collection_name, os.path.join(backup_dir, bson_file), metadata_file, mongorestore_path, verbose)
+            futures[future] = collection_name
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Restore progress"):
+            future.result()
+
+
+def _insert_batch(collection, batch):
+    try:
+        collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+    except BulkWriteError as e:
+        # documents already present are skipped, anything else is a real failure
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+
+def restore_collection_pymongo(db, collection_name, bson_path, batch_size=10000):
+    collection = db[collection_name]
+    batch = []
+    with open(bson_path, "rb") as f:
+        for doc in decode_file_iter(f):
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                _insert_batch(collection, batch)
+                batch = []
+    if batch:
+        _insert_batch(collection, batch)
+
+def restore_mongodb_pymongo(db_name, backup_dir, batch_size=10000, max_workers=4):
+    # restore without mongorestore, for deployments that only have pymongo;
+    # reads plain .bson dumps only, indexes in the .metadata files are not
+    # recreated on this path
+    files = os.listdir(backup_dir)
+    bson_files = [f for f in files if f.endswith('.bson')]
+    if not bson_files and any(f.endswith('.archive.gz') for f in files):
+        raise ValueError(f'"{backup_dir}" only holds mongodump archives, restore them with restore_mongodb instead.')
+
+    # primary acknowledgement only, no journal wait, the dump is the source of truth
+    db = _CLIENT.get_database(db_name, write_concern=WriteConcern(w=1, j=False))
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {}
+        for bson_file in bson_files:
+            collection_name = bson_file.split('.')[0]  # extract collection names
+            future = executor.submit(restore_collection_pymongo, db, collection_name, os.path.join(backup_dir, bson_file), batch_size)
+            futures[future] = collection_name
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Restore progress"):
+            future.result()
+
+
+if __name__ == "__main__":
+    
+    database_name = "FactorBase"  # substitute for target database storage name
+    # set export directory next to the current script
+    backup_directory = os.path.join(_THIS_DIR, "exports", database_name) 
+    restore_mongodb(database_name, backup_directory)
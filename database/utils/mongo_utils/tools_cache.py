@@ -0,0 +1,44 @@
+import os
+import json
+import tempfile
+
+# tool locations found by earlier runs, verified before reuse
+TOOLS_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".frozen_mongo_tools.json")
+
+def load_tools_cache():
+    try:
+        with open(TOOLS_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_tools_cache(key, path):
+    tools_cache = load_tools_cache()
+    tools_cache[key] = path
+    # write a temp file next to the cache and swap it in, a crash or a
+    # concurrent run never leaves a truncated cache behind
+    cache_dir = os.path.dirname(TOOLS_CACHE_FILE)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".frozen_mongo_tools.", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(tools_cache, f)
+        os.replace(tmp_path, TOOLS_CACHE_FILE)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def cached_tool_path(root_dir, name, search, exists):
+    # reuse the path of an earlier run while `exists` still holds, else `search` and remember it
+    key = f"{os.path.abspath(root_dir)}:{name}"
+    path = load_tools_cache().get(key)
+    if path is not None and exists(path):
+        return path
+    path = search(root_dir, name)
+    if path is not None:
+        save_tools_cache(key, path)
+    return path
@@ -1,9 +1,10 @@
+import os
 import time
 import inspect
 import threading
 import concurrent.futures
-from queue import Queue
-from functools import wraps
+from collections import deque
+from functools import cache, wraps
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -34,28 +35,24 @@ if TYPE_CHECKING:
 
 def rate_limiter(max_calls_per_minute):
     def decorator(func):
-        calls = 0
-        start_time = time.time()
+        # start times of the calls made within the last minute
+        calls = deque()
         lock = threading.Lock()
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            nonlocal calls, start_time
-            with lock:
-                current_time = time.time()
-                if current_time - start_time > 60:
-                    # Reset the counter and the start time every minute
-                    calls = 0
-                    start_time = current_time
-                if calls >= max_calls_per_minute:
-                    # Sleep until the minute is over
-                    sleep_time = 60 - (current_time - start_time)
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
-                    # Reset after sleeping
-                    calls = 0
-                    start_time = time.time()
-                calls += 1
+            while True:
+                with lock:
+                    current_time = time.monotonic()
+                    while calls and current_time - calls[0] >= 60:
+                        calls.popleft()
+                    if len(calls) < max_calls_per_minute:
+                        calls.append(current_time)
+                        break
+                    # Sleep until the oldest call leaves the window
+                    sleep_time = 60 - (current_time - calls[0])
+                # Sleep outside the lock so other threads can still take free slots
+                time.sleep(sleep_time)
             return func(*args, **kwargs)
 
         return wrapper
@@ -78,52 +75,53 @@ class verboser(object):
         return wrapper
 
 
-def worker(queue):
-    while True:
-        func, args, kwargs = queue.get()
-        if func is None:
-            break
-        func(*args, **kwargs)
-        queue.task_done()
+# table name -> dispatch token, parsed once per distinct table
+_TASK_KEYS = {}
 
 
-def parallel_task(manager: "DataFeedManager", tasks: list):
-
+@cache
+def _get_fetch_dispatch():
     from ..datafeed import DataFeedManager
-    
-    # fetch_methods = [name for name, obj in DataFeedManager.__dict__.items() if callable(obj) and not name.startswith("_")]
-    methods= inspect.getmembers(DataFeedManager, predicate=inspect.isfunction)
-    fetch_methods = [method for method in methods if not method[0].startswith("_")]
 
-    task_queue = Queue()
-    num_threads = len(tasks)
+    # DataFeedManager does not change at runtime, so the lookup is built once;
+    # its own functions are sorted by name as inspect.getmembers returned them
+    fetch_methods = sorted(
+        (name, obj) for name, obj in vars(DataFeedManager).items()
+        if inspect.isfunction(obj) and not name.startswith("_")
+    )
 
-    # Start worker threads
-    threads = []
-    for _ in range(num_threads):
-        thread = threading.Thread(target=worker, args=(task_queue,))
-        thread.start()
-        threads.append(thread)
+    # map every name token to the first fetch method containing it, so each
+    # task resolves with one dict lookup instead of scanning all methods
+    dispatch = {}
+    for name, func in fetch_methods:
+        for token in name.split("_"):
+            dispatch.setdefault(token, func)
+    return dispatch, DataFeedManager.fetch_volumn_price_data
 
-    # Enqueue tasks with parameters
-    for param in tasks:
-        # fetch_method = next((method[1] for method in fetch_methods if param[0].split("_")[-2] in method[0].split("_")), None)
-        # fetch_func = fetch_method.__call__
-        # if fetch_func is None:
-        #     # raise ValueError(f"Error, datafeed function for {param} not found!")
-        #     fetch_func = manager.fetch_volumn_price_data
-        fetch_func = next((method[1].__get__(manager, DataFeedManager) for method in fetch_methods if param[0].split("_")[-2] in method[0].split("_")), manager.fetch_volumn_price_data)
-        task_queue.put((fetch_func, param, {}))
 
-    # Block until all tasks are done
-    task_queue.join()
+def parallel_task(manager: "DataFeedManager", tasks: list):
 
-    # Stop workers
-    for _ in range(num_threads):
-        task_queue.put((None, (), {}))
+    dispatch, default = _get_fetch_dispatch()
+    bound = {}
 
-    for thread in threads:
-        thread.join()
+    # resolve every task's fetch method before any thread starts
+    resolved = []
+    for param in tasks:
+        key = _TASK_KEYS.get(param[0])
+        if key is None:
+            key = _TASK_KEYS.setdefault(param[0], param[0].rsplit("_", 2)[-2])
+        func = dispatch.get(key, default)
+        if func not in bound:
+            bound[func] = func.__get__(manager, type(manager))
+        resolved.append((bound[func], param))
+
+    # the fetch methods are I/O bound and fan out requests themselves,
+    # so a bounded pool is enough instead of one thread per task
+    max_workers = max(1, min(len(tasks), (os.cpu_count() or 4) * 2))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_func, *param) for fetch_func, param in resolved]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
 
 
 # def rate_limiter(max_calls_per_minute):
@@ -148,21 +146,3 @@ def parallel_task(manager: "DataFeedManager", tasks: list):
 
 #         return wrapper
 #     return decorator
-
-
-# def parallel_task(manager: "DataFeedManager", tasks: list):
-
-#     from ..datafeed import DataFeedManager
-    
-#     methods= inspect.getmembers(DataFeedManager, predicate=inspect.isfunction)
-#     fetch_methods = [method for method in methods if not method[0].startswith("_")]
-    
-#     num_threads = len(tasks)
-#     with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
-#         futures = []
-#         for param in tasks:
-#             worker = next((method[1].__get__(manager, DataFeedManager) for method in fetch_methods if param[0].split("_")[-2] in method[0].split("_")), manager.fetch_volumn_price_data)
-#             futures.append(executor.submit(worker, *param))
-
-#         for future in concurrent.futures.as_completed(futures):
-#             future.result()
@@ -0,0 +1,30 @@
+import pytest
+import pandas as pd
+
+pytest.importorskip("chdb")
+pytest.importorskip("tushare")
+
+from chdb.session import Session
+from database.datafeed import DataFeedManager, TABLE_SPECS
+
+
+def test_chdb_insert_reads_local_arrow_table(tmp_path):
+    # skip __init__, it reads the db config and builds tushare feeds
+    manager = DataFeedManager.__new__(DataFeedManager)
+    manager.database = "chdb"
+    manager.db = Session(path=str(tmp_path))
+    manager._table_ticker_cache = {}
+    manager._query("CREATE DATABASE IF NOT EXISTS BaseDB")
+    manager._query("USE BaseDB")
+    manager._query(TABLE_SPECS["stock_limit"].ddl_for("chdb").format(table_name="stock_daily_limit"))
+
+    df = pd.DataFrame({
+        "ts_code": ["000001.SZ", "000001.SZ"],
+        "trade_date": pd.to_datetime(["2024-01-02", "2024-01-03"]),
+        "up_limit": [11.0, 12.0],
+        "down_limit": [9.0, 10.0],
+    })
+    manager._insert_df_to_table(df, "stock_daily_limit")
+
+    result = manager.db.query("SELECT ts_code, up_limit FROM stock_daily_limit ORDER BY trade_date", "CSV")
+    assert str(result).split() == ['"000001.SZ",11', '"000001.SZ",12']